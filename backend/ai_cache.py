@@ -0,0 +1,147 @@
+"""
+ai_cache.py
+-----------
+In-memory tier in front of the ``ai_outputs`` SQLite cache.
+
+``TTLCache`` is a bounded LRU whose entries expire after a per-feature TTL,
+so repeat generations are served without touching SQLite or decoding JSON.
+``AICacheStats`` keeps hit/miss/eviction counters per feature for both tiers.
+
+Entries are ``CachedOutput`` records that remember whether the data came from
+the model or from a deterministic fallback. An entry is stale once it is older
+than its feature's freshness window, and fallback entries are always stale;
+stale entries are still served but get regenerated in the background.
+
+Lookup order in main.ai_or_fallback:
+  memory (TTLCache) -> ai_outputs table -> LLM
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+# Seconds an output stays in the memory tier, per feature.
+FEATURE_TTLS: Dict[str, float] = {
+    "campaign_generator": 6 * 3600,
+    "sales_pitch": 6 * 3600,
+    "email_outreach": 6 * 3600,
+    "social_generator": 6 * 3600,
+    "lead_scoring_explanation": 24 * 3600,
+    "market_tool": 3600,
+    "market_intelligence": 3600,
+    "campaign_prediction_explanation": 1800,
+    "deal_assist": 1800,
+    "followup_plan": 1800,
+    "copilot_insights": 300,
+}
+DEFAULT_TTL = 3600.0
+
+# Seconds an output counts as fresh; older entries are served and refreshed.
+FEATURE_FRESHNESS: Dict[str, float] = {
+    "campaign_generator": 24 * 3600,
+    "sales_pitch": 24 * 3600,
+    "email_outreach": 24 * 3600,
+    "social_generator": 24 * 3600,
+    "lead_scoring_explanation": 7 * 24 * 3600,
+    "market_tool": 6 * 3600,
+    "market_intelligence": 6 * 3600,
+    "campaign_prediction_explanation": 3600,
+    "deal_assist": 2 * 3600,
+    "followup_plan": 2 * 3600,
+    "copilot_insights": 600,
+}
+DEFAULT_FRESHNESS = 6 * 3600.0
+
+SOURCE_MODEL = "model"
+SOURCE_FALLBACK = "fallback"
+
+
+def ttl_for(feature: str) -> float:
+    return FEATURE_TTLS.get(feature, DEFAULT_TTL)
+
+
+def freshness_for(feature: str) -> float:
+    return FEATURE_FRESHNESS.get(feature, DEFAULT_FRESHNESS)
+
+
+class CachedOutput(NamedTuple):
+    data: Dict[str, Any]
+    source: str         # SOURCE_MODEL or SOURCE_FALLBACK
+    created_at: float   # epoch seconds
+
+    def is_stale(self, feature: str, now: Optional[float] = None) -> bool:
+        if self.source != SOURCE_MODEL:
+            return True
+        return (now if now is not None else time.time()) - self.created_at > freshness_for(feature)
+
+
+class AICacheStats:
+    COUNTERS = (
+        "memory_hits", "db_hits", "misses", "stale_hits", "fallback_hits",
+        "memory_evictions", "memory_expirations", "db_evictions",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+
+    def incr(self, feature: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[feature][counter] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for feature, counts in sorted(self._counts.items()):
+                lookups = counts["memory_hits"] + counts["db_hits"] + counts["misses"]
+                hits = counts["memory_hits"] + counts["db_hits"]
+                result[feature] = dict(counts, hit_ratio=round(hits / lookups, 3) if lookups else 0.0)
+            return result
+
+
+class TTLCache:
+    """Thread-safe LRU with per-entry expiry. Keys are (feature, input_hash)."""
+
+    def __init__(self, max_entries: int, stats: AICacheStats) -> None:
+        self.max_entries = max_entries
+        self.stats = stats
+        self._data: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, feature: str, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get((feature, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[(feature, key)]
+                expired = True
+            else:
+                self._data.move_to_end((feature, key))
+                expired = False
+        if expired:
+            self.stats.incr(feature, "memory_expirations")
+            return None
+        return value
+
+    def set(self, feature: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else ttl_for(feature))
+        evicted = []
+        with self._lock:
+            self._data[(feature, key)] = (expires_at, value)
+            self._data.move_to_end((feature, key))
+            while len(self._data) > self.max_entries:
+                (old_feature, _), _ = self._data.popitem(last=False)
+                evicted.append(old_feature)
+        for old_feature in evicted:
+            self.stats.incr(old_feature, "memory_evictions")
+
+    def discard(self, feature: str, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop((feature, key), None)
+
+    def __len__(self) -> int:
+        return len(self._data)
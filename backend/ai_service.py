@@ -6,40 +6,26 @@ Handles all Groq API communication with context-aware, token-optimized prompts.
 
 Architecture:
   routes (main.py) → build_chat_context() → generate_chat_response() → Groq API
+  /chat/stream     → stream_chat_response() → Groq API (stream=True) → SSE
 """
 
-import os
 import re
 import json
 import logging
-from typing import Optional, List, Dict
-from dotenv import load_dotenv
-
-# ── Load .env first, before any os.getenv call ────────────────────────────────
-load_dotenv()
+from typing import AsyncIterator, Optional, List, Dict, Tuple
 
 logger = logging.getLogger("saleskpark.ai")
 logging.basicConfig(level=logging.INFO)
 
-# ── Groq client singleton ──────────────────────────────────────────────────────
 try:
-    from groq import Groq
-    _groq_available = True
+    from backend.circuit_breaker import CircuitOpenError, groq_breaker
+    from backend.groq_clients import get_async_groq_client, get_groq_client, unavailable_reason
 except ImportError:
-    _groq_available = False
-    logger.error("[ai_service] groq package missing. Run: pip install groq python-dotenv")
-
-_groq_client: Optional[object] = None
-_GROQ_API_KEY = os.getenv("GROQ_API_KEY", "").strip()
+    from circuit_breaker import CircuitOpenError, groq_breaker
+    from groq_clients import get_async_groq_client, get_groq_client, unavailable_reason
 
-if _GROQ_API_KEY and _groq_available:
-    try:
-        _groq_client = Groq(api_key=_GROQ_API_KEY)
-        logger.info("[ai_service] Groq client ready. Key: %s...", _GROQ_API_KEY[:8])
-    except Exception as e:
-        logger.error("[ai_service] Groq client init failed: %s", e)
-else:
-    logger.error("[ai_service] GROQ_API_KEY not set or groq not installed.")
+# Groq clients are built on the first chat call, see groq_clients.py.
+CHAT_MODEL = "llama-3.3-70b-versatile"
 
 
 # ── Page → URL map (used in navigation responses) ─────────────────────────────
@@ -245,29 +231,17 @@ def _parse_navigation(raw: str) -> dict:
     return {"response": raw}
 
 
-# ── Public Interface ───────────────────────────────────────────────────────────
-def generate_chat_response(
+# ── Request Builder ────────────────────────────────────────────────────────────
+def _prepare_chat(
     message: str,
     db_context: dict,
-    current_page: str = "unknown",
-    history: List[Dict[str, str]] = None,
-) -> dict:
+    current_page: str,
+    history: Optional[List[Dict[str, str]]],
+    client: Optional[object],
+) -> Tuple[Optional[dict], List[Dict[str, str]]]:
     """
-    Sends user message + minimal context to Groq and returns a structured dict.
-
-    Args:
-        message      : The user's chat message.
-        db_context   : Live pipeline metrics from SQLite.
-        current_page : The page the user is currently on (sent from frontend).
-        history      : Last N conversation turns [{role, content}, ...].
-
-    Returns:
-        dict with at minimum {"response": str}.
-        Navigation requests include {"action": "navigate", "page": str, "url": str}.
-
-    Raises:
-        RuntimeError : If Groq client is unavailable.
-        ValueError   : If message is empty.
+    Shared front half of the sync and async chat paths.
+    Returns (shortcut_reply, []) for zero-token answers, otherwise (None, messages).
     """
     clean = (message or "").strip()
     if not clean:
@@ -276,16 +250,19 @@ def generate_chat_response(
     # ── Zero-token greeting shortcut ──────────────────────────────────────────
     if _is_greeting(clean):
         logger.info("[ai_service] Greeting detected — skipping Groq call.")
-        return {"response": _GREETING_RESPONSE}
+        return {"response": _GREETING_RESPONSE}, []
 
     # ── Zero-token product question shortcut ──────────────────────────────────
     if _is_product_question(clean):
         logger.info("[ai_service] Product question detected — skipping Groq call.")
-        return {"response": _PRODUCT_RESPONSE}
+        return {"response": _PRODUCT_RESPONSE}, []
 
-    if not _groq_client:
-        missing = "GROQ_API_KEY not set" if not _GROQ_API_KEY else "groq package missing"
-        raise RuntimeError(f"Groq client not initialized: {missing}")
+    if not client:
+        raise RuntimeError(f"Groq client not initialized: {unavailable_reason()}")
+
+    # Fail fast instead of waiting on a provider that is known to be down.
+    if not groq_breaker.allow():
+        raise CircuitOpenError("Groq circuit breaker is open")
 
     # Build token-efficient inputs
     pipeline_summary = build_pipeline_summary(db_context)
@@ -308,18 +285,141 @@ def generate_chat_response(
         "[ai_service] Groq request | page=%s | history_turns=%d | msg='%s...'",
         current_page, len(trimmed_history), clean[:60],
     )
+    return None, messages
 
-    completion = _groq_client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=messages,
-        temperature=0.45,
-        max_tokens=280,
-        stream=False,
-    )
 
+def _finish_chat(completion) -> dict:
     raw_reply = completion.choices[0].message.content.strip()
     logger.info("[ai_service] Groq reply (%d chars): %s...", len(raw_reply), raw_reply[:80])
-
     return _parse_navigation(raw_reply)
 
 
+# ── Public Interface ───────────────────────────────────────────────────────────
+def generate_chat_response(
+    message: str,
+    db_context: dict,
+    current_page: str = "unknown",
+    history: List[Dict[str, str]] = None,
+) -> dict:
+    """
+    Sends user message + minimal context to Groq and returns a structured dict.
+
+    Args:
+        message      : The user's chat message.
+        db_context   : Live pipeline metrics from SQLite.
+        current_page : The page the user is currently on (sent from frontend).
+        history      : Last N conversation turns [{role, content}, ...].
+
+    Returns:
+        dict with at minimum {"response": str}.
+        Navigation requests include {"action": "navigate", "page": str, "url": str}.
+
+    Raises:
+        RuntimeError : If Groq client is unavailable, or CircuitOpenError while
+                       the Groq circuit breaker is open.
+        ValueError   : If message is empty.
+    """
+    client = get_groq_client()
+    shortcut, messages = _prepare_chat(message, db_context, current_page, history, client)
+    if shortcut:
+        return shortcut
+
+    try:
+        completion = client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=0.45,
+            max_tokens=280,
+            stream=False,
+        )
+    except Exception:
+        groq_breaker.record_failure()
+        raise
+    groq_breaker.record_success()
+    return _finish_chat(completion)
+
+
+async def generate_chat_response_async(
+    message: str,
+    db_context: dict,
+    current_page: str = "unknown",
+    history: List[Dict[str, str]] = None,
+) -> dict:
+    """
+    Async twin of generate_chat_response on the AsyncGroq client, so a chat
+    request waiting on the model does not hold a worker thread.
+    Same arguments, return value and exceptions.
+    """
+    client = get_async_groq_client()
+    shortcut, messages = _prepare_chat(message, db_context, current_page, history, client)
+    if shortcut:
+        return shortcut
+
+    try:
+        completion = await client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=0.45,
+            max_tokens=280,
+            stream=False,
+        )
+    except Exception:
+        groq_breaker.record_failure()
+        raise
+    groq_breaker.record_success()
+    return _finish_chat(completion)
+
+
+async def stream_chat_response(
+    message: str,
+    db_context: dict,
+    current_page: str = "unknown",
+    history: List[Dict[str, str]] = None,
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Streaming variant of generate_chat_response_async.
+
+    Yields ("token", {"text": str}) events as Groq produces them, then exactly
+    one ("done", reply) event where reply is _parse_navigation() of the full
+    text (or the zero-token shortcut). A reply that opens with "{" or a code
+    fence may be navigation JSON, so it is held back and only sent in "done".
+    """
+    client = get_async_groq_client()
+    shortcut, messages = _prepare_chat(message, db_context, current_page, history, client)
+    if shortcut:
+        yield "done", shortcut
+        return
+
+    parts: List[str] = []
+    try:
+        stream = await client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=0.45,
+            max_tokens=280,
+            stream=True,
+        )
+
+        held: Optional[bool] = None   # undecided until the first non-blank text
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            if held is None:
+                head = "".join(parts).lstrip()
+                if not head:
+                    continue
+                held = head[0] in "{`"
+                if not held:
+                    yield "token", {"text": "".join(parts)}
+            elif not held:
+                yield "token", {"text": delta}
+    except Exception:
+        groq_breaker.record_failure()
+        raise
+    groq_breaker.record_success()
+
+    raw_reply = "".join(parts).strip()
+    logger.info("[ai_service] Groq stream reply (%d chars): %s...", len(raw_reply), raw_reply[:80])
+    yield "done", _parse_navigation(raw_reply)
@@ -0,0 +1,134 @@
+"""
+cache_keys.py
+-------------
+Per-feature cache keys for the ``ai_outputs`` cache.
+
+The payload handed to ``ai_or_fallback`` describes the request, but hashing it
+verbatim makes near-identical requests miss: "SaaS " and "saas" differ, an
+average score of 71.3 vs 71.6 differs, and volatile context (a live search
+summary, the current top leads) changes on every call. ``cache_key`` builds a
+canonical form first:
+
+  * strings are case-folded with whitespace collapsed,
+  * rules in ``FEATURE_KEY_RULES`` drop volatile fields (they still reach the
+    prompt, just not the key), bucket numbers, or treat lists as sets,
+
+and hashes the flattened ``path=value`` pairs with BLAKE2b instead of
+``json.dumps`` + SHA-256. Rule paths are dotted (``snapshot.avg_score``) and a
+trailing ``*`` matches every key of a mapping (``distribution.*``).
+"""
+
+import hashlib
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+Rule = Optional[Callable[[Any], Any]]
+
+DROP: Rule = None
+
+
+def nearest(step: float) -> Callable[[Any], Any]:
+    """Round a number to the nearest multiple of ``step``."""
+
+    def bucket(value: Any) -> Any:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return value
+        rounded = round(value / step) * step
+        return int(rounded) if float(step).is_integer() else round(rounded, 6)
+
+    return bucket
+
+
+def significant(digits: int) -> Callable[[Any], Any]:
+    """Keep ``digits`` significant digits: 1234 -> 1200, 57 -> 57."""
+
+    def bucket(value: Any) -> Any:
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value == 0:
+            return value
+        magnitude = math.floor(math.log10(abs(value)))
+        rounded = round(value, digits - 1 - magnitude)
+        return int(rounded) if isinstance(value, int) else rounded
+
+    return bucket
+
+
+def unordered(value: Any) -> Any:
+    """Compare a list as a set of canonical strings."""
+    if not isinstance(value, (list, tuple)):
+        return value
+    return sorted({canonical_text(item) for item in value})
+
+
+FEATURE_KEY_RULES: Dict[str, Dict[str, Rule]] = {
+    "lead_scoring_explanation": {
+        "budget": significant(2),
+    },
+    "campaign_prediction_explanation": {
+        "average_lead_score": nearest(5),
+        "engagement_score": nearest(5),
+        "total_leads": significant(2),
+    },
+    "market_intelligence": {
+        "search_summary": DROP,
+        "industries_in_leads": unordered,
+        "regions_in_leads": unordered,
+        "campaign_products": unordered,
+    },
+    "deal_assist": {
+        "budget": significant(2),
+    },
+    "copilot_insights": {
+        "snapshot.top_leads": DROP,
+        "snapshot.total_campaigns": DROP,
+        "snapshot.avg_score": nearest(5),
+        "snapshot.total_leads": significant(2),
+        "snapshot.hot_leads": significant(2),
+        "snapshot.warm_leads": significant(2),
+        "snapshot.cold_leads": significant(2),
+        "distribution.*": significant(2),
+    },
+}
+
+
+def canonical_text(value: Any) -> str:
+    if isinstance(value, str):
+        # str.split() also splits on \x1c-\x1f, so separators can't leak in.
+        return " ".join(value.split()).casefold()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if value is None:
+        return "~"
+    return str(value)
+
+
+def _flatten(value: Any, path: str, rules: Dict[str, Rule], out: List[str]) -> None:
+    if isinstance(value, dict):
+        for key in sorted(value, key=str):
+            child = f"{path}.{key}" if path else str(key)
+            rule = rules.get(child, rules.get(f"{path}.*" if path else "*", _keep))
+            if rule is DROP:
+                continue
+            _flatten(value[key] if rule is _keep else rule(value[key]), child, rules, out)
+    elif isinstance(value, (list, tuple)):
+        out.append(f"{path}#{len(value)}")
+        for index, item in enumerate(value):
+            _flatten(item, f"{path}[{index}]", rules, out)
+    else:
+        out.append(f"{path}={canonical_text(value)}")
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+def canonical_payload(feature: str, payload: Dict[str, Any]) -> str:
+    """The string that is hashed for ``feature``; useful for debugging misses."""
+    parts: List[str] = []
+    _flatten(payload, "", FEATURE_KEY_RULES.get(feature, {}), parts)
+    return "\x1f".join(parts)
+
+
+def cache_key(feature: str, payload: Dict[str, Any]) -> str:
+    return hashlib.blake2b(canonical_payload(feature, payload).encode("utf-8"), digest_size=16).hexdigest()
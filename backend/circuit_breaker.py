@@ -0,0 +1,140 @@
+"""
+circuit_breaker.py
+------------------
+Failure-rate circuit breaker for the Groq LLM client.
+
+States:
+  closed    -> calls go through; outcomes are kept in a rolling window and the
+               circuit opens once at least ``min_calls`` have been seen and the
+               failure rate reaches ``failure_rate``.
+  open      -> calls are refused (``allow()`` is False) so callers fall back
+               instantly, until ``open_seconds`` have passed.
+  half_open -> one probe call is let through; success closes the circuit,
+               failure opens it again.
+
+``groq_breaker`` is shared by phase2_ai and ai_service so both paths trip and
+recover together.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger("salespark.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised by callers that cannot fall back on their own while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._counts = {"allowed": 0, "rejected": 0, "successes": 0, "failures": 0, "trips": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                allowed = True
+            elif state == HALF_OPEN and (
+                self._probe_started is None or now - self._probe_started >= self.open_seconds
+            ):
+                # A probe that never reported back (e.g. cancelled) doesn't block forever.
+                self._probe_started = now
+                allowed = True
+            else:
+                allowed = False
+            self._counts["allowed" if allowed else "rejected"] += 1
+            return allowed
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counts["successes"] += 1
+            if self._state == HALF_OPEN:
+                logger.info("[%s] Probe succeeded, closing circuit", self.name)
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._counts["failures"] += 1
+            if self._state == HALF_OPEN:
+                self._trip(now, "probe failed")
+                return
+            self._outcomes.append(False)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._trip(now, f"{failures}/{len(self._outcomes)} recent calls failed")
+
+    def _trip(self, now: float, reason: str) -> None:
+        logger.warning("[%s] Opening circuit for %gs: %s", self.name, self.open_seconds, reason)
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_started = None
+        self._outcomes.clear()
+        self._counts["trips"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._probe_started = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            window = len(self._outcomes)
+            return dict(
+                self._counts,
+                state=state,
+                window_calls=window,
+                window_failure_rate=round(self._outcomes.count(False) / window, 3) if window else 0.0,
+            )
+
+
+groq_breaker = CircuitBreaker(
+    "groq",
+    window=int(os.getenv("LLM_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+    failure_rate=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+    open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30")),
+)
@@ -0,0 +1,67 @@
+"""
+columnar.py
+-----------
+Opt-in compact response format for list endpoints (``?format=columnar``).
+
+Instead of one object per row (every column name repeated per row), the body
+carries the column names once and one array per column:
+
+    {"columns": ["id", "company"], "data": [[3, 1], ["Acme", "Globex"]], ...}
+
+Columns are built by transposing plain cursor tuples (no ``sqlite3.Row`` or
+per-row dicts) and the body is encoded with orjson when it is installed,
+falling back to the standard library encoder.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("rows", "columnar")
+
+
+def parse_format(fmt: str) -> str:
+    fmt = (fmt or "rows").strip().lower()
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+    return fmt
+
+
+def tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """A cursor on ``conn`` that yields plain tuples regardless of the connection's row_factory."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def transpose(rows: Sequence[Sequence[Any]], width: int) -> List[Sequence[Any]]:
+    """Row tuples -> one sequence per column (``width`` empty columns for no rows)."""
+    if not rows:
+        return [[] for _ in range(width)]
+    return list(zip(*rows))
+
+
+def from_records(records: Iterable[Dict[str, Any]], columns: Sequence[str]) -> List[List[Any]]:
+    """Columns from already-built records, for endpoints that compute their rows."""
+    records = list(records)
+    return [[record.get(column) for record in records] for column in columns]
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str)
+    return json.dumps(content, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def columnar_response(columns: Sequence[str], data: Sequence[Sequence[Any]], **extra: Any) -> Response:
+    body = {"format": "columnar", "columns": list(columns), "data": data, "row_count": len(data[0]) if data else 0}
+    body.update(extra)
+    return Response(content=dumps(body), media_type="application/json")
@@ -0,0 +1,102 @@
+"""
+conditional_get.py
+------------------
+ETag / Last-Modified validation for the read-only analytics endpoints.
+
+Every write moves the shared ``data_version`` row (see snapshot_cache.py),
+so its version and change time identify the state these endpoints are
+computed from, identically in every worker; a database that is recreated or
+restored gets a different change time and therefore different ETags.
+``ConditionalGetMiddleware`` answers
+``If-None-Match`` / ``If-Modified-Since`` with 304 before the route runs (the
+only query is the one-row version read, done in the threadpool), and stamps 200 responses with ``ETag``, ``Last-Modified`` and a
+``Cache-Control`` that lets a shared proxy keep the body and revalidate it.
+
+The ETag is weak (``W/``): bodies may be re-encoded (gzip) by the proxy, and
+the same version always yields a semantically equal body for a given URL.
+"""
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Tuple
+
+try:
+    from backend.snapshot_cache import DataVersion
+except ImportError:
+    from snapshot_cache import DataVersion
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+DEFAULT_CACHE_CONTROL = "public, no-cache"
+
+
+class VersionValidators:
+    """Validators for responses computed from one ``DataVersion``."""
+
+    def __init__(self, version: DataVersion, paths: Collection[str], cache_control: str = DEFAULT_CACHE_CONTROL) -> None:
+        self.version = version
+        self.paths = frozenset(paths)
+        self.cache_control = cache_control
+        self.not_modified = 0
+
+    @staticmethod
+    def etag(version: int, changed_at: float) -> str:
+        return f'W/"{version}-{int(changed_at * 1000):x}"'
+
+    def headers(self, version: int, changed_at: float) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"etag", self.etag(version, changed_at).encode("latin-1")),
+            (b"last-modified", formatdate(changed_at, usegmt=True).encode("latin-1")),
+            (b"cache-control", self.cache_control.encode("latin-1")),
+        ]
+
+    def is_fresh(self, request_headers: Dict[bytes, bytes], version: int, changed_at: float) -> bool:
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None:
+            etag = self.etag(version, changed_at).removeprefix("W/")
+            candidates = [tag.strip() for tag in if_none_match.decode("latin-1").split(",")]
+            # Weak comparison: W/"x" matches "x".
+            return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since.decode("latin-1")).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(changed_at) <= since
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"etag": self.etag(*self.version.current()), "not_modified": self.not_modified}
+
+
+class ConditionalGetMiddleware:
+    def __init__(self, app: ASGIApp, *, validators: VersionValidators) -> None:
+        self.app = app
+        self.validators = validators
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        validators = self.validators
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or scope["path"] not in validators.paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Read before the handler runs: a write that lands mid-request leaves
+        # the response tagged with the older version, so the next request
+        # revalidates instead of pinning stale data.
+        version, changed_at = await validators.version.current_async()
+        if validators.is_fresh(dict(scope["headers"]), version, changed_at):
+            validators.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": validators.headers(version, changed_at)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = dict(message, headers=list(message.get("headers", [])) + validators.headers(version, changed_at))
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
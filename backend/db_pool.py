@@ -0,0 +1,119 @@
+"""
+db_pool.py
+----------
+Pooled, tuned SQLite connections for the SalesSparkAI backend.
+
+Every helper in main.py used to open a brand-new connection, so a single
+/market/analyze request paid the connect + pragma cost four or more times.
+Connections are now checked out of a bounded LIFO pool and handed back when
+the caller runs ``conn.close()``, so existing call sites keep working as-is.
+
+Pragmas are applied once, when a connection is first created:
+  journal_mode=WAL   (writer pool only; persistent in the database file)
+  busy_timeout       wait on locks instead of failing with "database is locked"
+  synchronous=NORMAL safe with WAL, avoids an fsync on every commit
+  mmap_size          memory-mapped reads
+  cache_size         larger page cache per connection
+
+Read-only pools set ``PRAGMA query_only`` so GET endpoints can never write.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger("salespark.db_pool")
+
+CONNECTION_PRAGMAS: Tuple[Tuple[str, object], ...] = (
+    ("busy_timeout", 5000),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 268435456),   # 256 MB
+    ("cache_size", -16000),     # ~16 MB (negative = KiB)
+    ("temp_store", "MEMORY"),
+)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool."""
+
+    _pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def discard(self) -> None:
+        """Really close the underlying connection."""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable SQLite connections.
+
+    ``size`` caps the number of *idle* connections kept around. Under a burst
+    more connections may be opened; the extras are closed on release instead
+    of being pooled.
+    """
+
+    def __init__(self, path: str, *, size: int = 8, readonly: bool = False) -> None:
+        self.path = path
+        self.size = size
+        self.readonly = readonly
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(self.path, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if not self.readonly:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {name} = {value}")
+        if self.readonly:
+            conn.execute("PRAGMA query_only = ON")
+        conn._pool = self
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn: PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.discard()
+        except sqlite3.Error as exc:
+            logger.warning("[db_pool] Dropping broken connection: %s", exc)
+            conn.discard()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().discard()
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "readonly": self.readonly,
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "created": self._created,
+        }
@@ -0,0 +1,76 @@
+"""
+deadlines.py
+------------
+Per-route latency budgets for async endpoints.
+
+``@latency_budget(seconds)`` (placed under ``@app.post``) records a deadline
+in a context variable when the request starts; code further down the call
+chain asks ``remaining_budget()`` how long it may still wait. ai_or_fallback_async
+uses it to answer with the deterministic fallback when the LLM is too slow,
+while ``detach()`` keeps the late generation running so its result is still
+cached for the next request.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger("salespark.deadlines")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("salespark_deadline", default=None)
+_background: Set["asyncio.Future[Any]"] = set()
+_stats: Counter = Counter()
+
+
+def latency_budget(seconds: float) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _deadline.set(time.monotonic() + seconds)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _deadline.reset(token)
+
+        wrapper.latency_budget = seconds
+        return wrapper
+
+    return decorator
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left for the current request, or None when the route has no budget."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def record_expired(label: str) -> None:
+    _stats[f"expired_{label}"] += 1
+
+
+def detach(task: "asyncio.Future[Any]", label: str) -> None:
+    """Let ``task`` finish after its request has been answered."""
+    _background.add(task)
+    _stats["detached"] += 1
+
+    def done(finished: "asyncio.Future[Any]") -> None:
+        _background.discard(finished)
+        if finished.cancelled():
+            return
+        exc = finished.exception()
+        if exc is not None:
+            logger.warning("[deadline] Background %s generation failed: %s", label, exc)
+        else:
+            _stats["completed_late"] += 1
+
+    task.add_done_callback(done)
+
+
+def stats() -> Dict[str, Any]:
+    return dict(_stats, running=len(_background))
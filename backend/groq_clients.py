@@ -0,0 +1,84 @@
+"""
+groq_clients.py
+---------------
+Process-wide Groq clients shared by ai_service and phase2_ai, built lazily.
+
+Importing ``groq`` and constructing the sync and async clients is deferred
+until the first LLM call, so importing the app (tests, CLI tools, worker
+boot) never pays for it. Both modules get the same pair of clients instead
+of building one pair each. A missing package or ``GROQ_API_KEY`` is logged
+once; the getters then return None and callers use their fallbacks.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger("salespark.groq_clients")
+
+_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+_error: Optional[str] = None
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load ``.env`` into the environment once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def _build() -> None:
+    global _error
+    load_env()
+    api_key = os.getenv("GROQ_API_KEY", "").strip()
+    if not api_key:
+        _error = "GROQ_API_KEY not set"
+    else:
+        try:
+            from groq import AsyncGroq, Groq
+        except ImportError:
+            _error = "groq package missing"
+        else:
+            try:
+                _clients["sync"] = Groq(api_key=api_key)
+                _clients["async"] = AsyncGroq(api_key=api_key)
+                logger.info("[groq] Clients ready. Key: %s...", api_key[:8])
+                return
+            except Exception as exc:
+                _error = f"client init failed: {exc}"
+    logger.error("[groq] Groq unavailable (%s). Run: pip install groq python-dotenv", _error)
+
+
+def _get(kind: str) -> Optional[Any]:
+    if not _clients and _error is None:
+        with _lock:
+            if not _clients and _error is None:
+                _build()
+    return _clients.get(kind)
+
+
+def get_groq_client() -> Optional[Any]:
+    return _get("sync")
+
+
+def get_async_groq_client() -> Optional[Any]:
+    return _get("async")
+
+
+def unavailable_reason() -> Optional[str]:
+    """Why the clients are None, or None if they were built (or not tried yet)."""
+    return _error
+
+
+def reset() -> None:
+    """Forget the clients (e.g. after rotating GROQ_API_KEY); the next call rebuilds them."""
+    global _error
+    with _lock:
+        _clients.clear()
+        _error = None
@@ -0,0 +1,326 @@
+"""
+jobs.py
+-------
+Background job runner for long AI generations (market analysis, campaigns,
+deal assist, follow-up plans).
+
+``POST /jobs/{feature}`` stores a ``queued`` row in the ``jobs`` table and
+returns its id at once; a fixed pool of asyncio workers runs the registered
+route handler and writes the result (or error) back to the row. Clients poll
+``GET /jobs/{id}`` or follow ``GET /jobs/{id}/events`` (SSE). Finished jobs are
+deleted once they are older than ``result_ttl``.
+
+Several processes may share the table. A worker claims a job with a
+conditional ``UPDATE ... WHERE status = 'queued'``, records itself as the
+row's ``owner`` and holds a lease (``lease_until``) that a heartbeat renews
+while the handler runs. Only jobs whose lease has expired (their process
+died) are put back in the queue, on start and periodically; a process that
+shuts down cleanly hands its running jobs back at once.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+logger = logging.getLogger("salespark.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+JOB_COLUMNS = ("id", "feature", "status", "result", "error", "created_at", "started_at", "finished_at")
+
+Handler = Callable[[BaseModel], Awaitable[Any]]
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class JobManager:
+    def __init__(
+        self,
+        connect: Callable[..., Any],
+        *,
+        workers: int = 4,
+        max_queued: int = 100,
+        result_ttl: float = 3600.0,
+        cleanup_interval: float = 60.0,
+        lease: float = 60.0,
+    ) -> None:
+        self._connect = connect
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease = lease
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.cleanup_interval = cleanup_interval
+        self.handlers: Dict[str, Tuple[Type[BaseModel], Handler]] = {}
+        self._queue: Optional["asyncio.Queue[str]"] = None
+        self._enqueued: Set[str] = set()
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = asyncio.Lock()
+        self._counts = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0, "expired": 0, "recovered": 0}
+
+    def register(self, feature: str, request_model: Type[BaseModel], handler: Handler) -> None:
+        self.handlers[feature] = (request_model, handler)
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+    async def start(self) -> None:
+        """Start the workers on the running loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        async with self._start_lock:
+            if self._loop is loop and self._tasks:
+                return
+            self._queue = asyncio.Queue()
+            self._enqueued.clear()
+            self._changed = asyncio.Condition()
+            await self._requeue()
+            self._tasks = [asyncio.ensure_future(self._worker(index)) for index in range(self.workers)]
+            self._tasks.append(asyncio.ensure_future(self._janitor()))
+            self._loop = loop
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        released = await run_in_threadpool(self._release)
+        if released:
+            logger.info("[jobs] Handed back %d running jobs", released)
+
+    # ── public API ───────────────────────────────────────────────────────────
+    async def submit(self, feature: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if feature not in self.handlers:
+            raise HTTPException(status_code=404, detail=f"Unknown job type '{feature}'. Use one of: {', '.join(self.handlers)}.")
+        request_model, _ = self.handlers[feature]
+        request_model(**body)  # validate up front; raises pydantic.ValidationError
+        await self.start()
+        if self._queue.qsize() >= self.max_queued:
+            self._counts["rejected"] += 1
+            raise QueueFullError(f"{self._queue.qsize()} jobs already queued")
+
+        job_id = uuid.uuid4().hex
+        await run_in_threadpool(self._insert, job_id, feature, body)
+        self._enqueue(job_id)
+        self._counts["submitted"] += 1
+        return {"job_id": job_id, "feature": feature, "status": QUEUED}
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await run_in_threadpool(self._load, job_id)
+
+    async def events(self, job_id: str, keepalive: float = 15.0):
+        """Yield (event, job) on every status change until the job finishes."""
+        await self.start()
+        last_status = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                yield "error", {"job_id": job_id, "error": "Job not found or expired"}
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield ("done" if last_status in FINISHED else "status"), job
+                if last_status in FINISHED:
+                    return
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield "keepalive", None
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._counts,
+            owner=self.owner,
+            queued=self._queue.qsize() if self._queue else 0,
+            workers=sum(1 for task in self._tasks[: self.workers] if not task.done()),
+        )
+
+    # ── workers ──────────────────────────────────────────────────────────────
+    def _enqueue(self, job_id: str) -> None:
+        if job_id not in self._enqueued:
+            self._enqueued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _requeue(self) -> None:
+        """Queue every claimable job, after taking back those whose lease expired."""
+        recovered, pending = await run_in_threadpool(self._recover)
+        if recovered:
+            self._counts["recovered"] += recovered
+            logger.info("[jobs] Recovered %d jobs with an expired lease", recovered)
+        for job_id in pending:
+            self._enqueue(job_id)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await run_in_threadpool(self._renew, job_id):
+                logger.warning("[jobs] Lost the lease on job %s", job_id)
+                return
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._enqueued.discard(job_id)
+            row = await run_in_threadpool(self._claim, job_id)
+            if row is None:
+                continue  # claimed by another worker or process
+            feature, body = row
+            await self._notify()
+            request_model, handler = self.handlers[feature]
+            heartbeat = asyncio.ensure_future(self._heartbeat(job_id))
+            try:
+                result = await handler(request_model(**body))
+                await run_in_threadpool(self._finish, job_id, SUCCEEDED, result, None)
+                self._counts["succeeded"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                detail = exc.detail if isinstance(exc, HTTPException) else f"{type(exc).__name__}: {exc}"
+                logger.warning("[jobs] %s job %s failed: %s", feature, job_id, detail)
+                await run_in_threadpool(self._finish, job_id, FAILED, None, str(detail))
+                self._counts["failed"] += 1
+            finally:
+                heartbeat.cancel()
+            await self._notify()
+
+    async def _janitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                await self._requeue()
+                removed = await run_in_threadpool(self.cleanup)
+                if removed:
+                    await self._notify()
+            except Exception as exc:
+                logger.warning("[jobs] Cleanup failed: %s", exc)
+
+    # ── SQLite ───────────────────────────────────────────────────────────────
+    def _insert(self, job_id: str, feature: str, body: Dict[str, Any]) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO jobs (id, feature, status, request) VALUES (?, ?, ?, ?)",
+            (job_id, feature, QUEUED, json.dumps(body)),
+        )
+        conn.commit()
+        conn.close()
+
+    def _claim(self, job_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        conn = self._connect()
+        cur = conn.execute(
+            """
+            UPDATE jobs SET status = ?, owner = ?, lease_until = ?, started_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = ?
+            """,
+            (RUNNING, self.owner, time.time() + self.lease, job_id, QUEUED),
+        )
+        row = None
+        if cur.rowcount:
+            row = conn.execute("SELECT feature, request FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.commit()
+        conn.close()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _renew(self, job_id: str) -> bool:
+        conn = self._connect()
+        cur = conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+            (time.time() + self.lease, job_id, RUNNING, self.owner),
+        )
+        renewed = cur.rowcount > 0
+        conn.commit()
+        conn.close()
+        return renewed
+
+    def _finish(self, job_id: str, status: str, result: Any, error: Optional[str]) -> None:
+        # Only the owner may finish: after a lost lease the job belongs to someone else.
+        conn = self._connect()
+        conn.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP, lease_until = NULL
+            WHERE id = ? AND status = ? AND owner = ?
+            """,
+            (status, json.dumps(result, default=str) if result is not None else None, error, job_id, RUNNING, self.owner),
+        )
+        conn.commit()
+        conn.close()
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect(readonly=True)
+        cur = conn.cursor()
+        cur.row_factory = None
+        row = cur.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        job = dict(zip(JOB_COLUMNS, row))
+        job = {"job_id": job.pop("id"), **job}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _recover(self) -> Tuple[int, List[str]]:
+        """Put running jobs with an expired lease back in the queue; returns (recovered, queued ids)."""
+        conn = self._connect()
+        cur = conn.execute(
+            """
+            UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, started_at = NULL
+            WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)
+            """,
+            (QUEUED, RUNNING, time.time()),
+        )
+        recovered = cur.rowcount
+        rows = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)).fetchall()
+        conn.commit()
+        conn.close()
+        return recovered, [row[0] for row in rows]
+
+    def _release(self) -> int:
+        """Hand this process's running jobs back to the queue (clean shutdown)."""
+        conn = self._connect()
+        cur = conn.execute(
+            """
+            UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, started_at = NULL
+            WHERE status = ? AND owner = ?
+            """,
+            (QUEUED, RUNNING, self.owner),
+        )
+        released = cur.rowcount
+        conn.commit()
+        conn.close()
+        return released
+
+    def cleanup(self) -> int:
+        """Delete finished jobs older than ``result_ttl``."""
+        conn = self._connect()
+        cur = conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < datetime('now', ?)",
+            (SUCCEEDED, FAILED, f"-{int(self.result_ttl)} seconds"),
+        )
+        removed = cur.rowcount
+        conn.commit()
+        conn.close()
+        self._counts["expired"] += removed
+        return removed
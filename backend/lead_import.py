@@ -0,0 +1,159 @@
+"""
+lead_import.py
+--------------
+Incremental CSV / NDJSON parsing for the bulk lead import endpoint.
+
+The request body is consumed chunk by chunk, so memory use is bounded by the
+batch size rather than by the size of the upload. Records are yielded as
+``(record_number, fields, error)`` tuples: exactly one of ``fields`` /
+``error`` is set, so one malformed row never aborts the whole import, and a
+stray quote in a CSV costs one record rather than everything after it.
+"""
+
+import codecs
+import csv
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# Upper bound on one CSV record (quoted fields may contain newlines). A record
+# still open past either limit is reported as broken and parsing resumes on
+# the line after the one that opened it.
+MAX_RECORD_LINES = 100
+MAX_RECORD_CHARS = 64 * 1024
+
+
+def detect_format(explicit: Optional[str], content_type: str) -> str:
+    if explicit:
+        fmt = explicit.strip().lower()
+        if fmt == "jsonl":
+            fmt = "ndjson"
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format '{explicit}'. Use one of: {', '.join(SUPPORTED_FORMATS)}.")
+        return fmt
+    content_type = (content_type or "").lower()
+    if "ndjson" in content_type or "jsonl" in content_type or "json" in content_type:
+        return "ndjson"
+    return "csv"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _clean(fields: Dict[str, Any]) -> Dict[str, Any]:
+    # Drop blanks so model defaults (deal_stage, optional fields) still apply.
+    return {
+        str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+        for key, value in fields.items()
+        if key is not None and value is not None and not (isinstance(value, str) and not value.strip())
+    }
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[str],
+    *,
+    max_record_lines: int = MAX_RECORD_LINES,
+    max_record_chars: int = MAX_RECORD_CHARS,
+) -> AsyncIterator[Record]:
+    header: Optional[List[str]] = None
+    pending: List[str] = []  # physical lines of the logical record being read
+    pending_chars = 0
+    quotes = 0
+    number = 0
+    source = lines.__aiter__()
+    replay: Deque[str] = deque()
+    exhausted = False
+    while True:
+        if replay:
+            line = replay.popleft()
+        elif not exhausted:
+            try:
+                line = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                continue
+        elif pending and "".join(pending).strip():
+            # Unterminated quote at the end: drop its first line, re-read the rest.
+            number += 1
+            yield number, None, "Unterminated quoted field"
+            replay.extend(pending[1:])
+            pending, pending_chars, quotes = [], 0, 0
+            continue
+        else:
+            break
+
+        # A quoted field may span physical lines: keep joining until the
+        # quotes balance before handing the record to the csv module.
+        pending.append(line)
+        pending_chars += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            if len(pending) >= max_record_lines or pending_chars > max_record_chars:
+                # Most likely a stray quote: report the line that opened it and
+                # resume with the next one instead of swallowing the rest.
+                number += 1
+                yield number, None, (
+                    f"Unbalanced quote: record not closed within {max_record_lines} lines "
+                    f"or {max_record_chars} characters"
+                )
+                replay.extendleft(reversed(pending[1:]))
+                pending, pending_chars, quotes = [], 0, 0
+            continue
+        record = "\n".join(pending)
+        pending, pending_chars, quotes = [], 0, 0
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as exc:
+            number += 1
+            yield number, None, f"Malformed CSV: {exc}"
+            continue
+        if header is None:
+            header = [value.strip().lower() for value in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield number, _clean(dict(zip(header, values))), None
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            parsed = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(parsed, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, _clean(parsed), None
+
+
+def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    lines = iter_lines(chunks)
+    if fmt == "ndjson":
+        return iter_ndjson_records(lines)
+    return iter_csv_records(lines)
@@ -0,0 +1,152 @@
+"""
+live_updates.py
+---------------
+Push channel for the dashboard (``GET /live``, Server-Sent Events).
+
+Instead of every open dashboard polling six endpoints every few seconds, one
+publisher task waits for ``DataVersion`` bumps, recomputes the dashboard
+payload once per version, encodes it once, and hands the same SSE frame to
+every subscriber. Each subscriber queue holds only the latest frame, so a
+slow client skips intermediate versions rather than buffering them.
+
+Bursts of writes (bulk imports) are coalesced by waiting ``min_interval``
+seconds after the first bump before recomputing.
+
+Writes made through other workers (or other processes) only show up in the
+shared database version, so while anyone is subscribed the publisher also
+re-reads it every ``poll_interval`` seconds; a change found that way wakes
+it exactly like a local bump.
+"""
+
+import asyncio
+import json
+import logging
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from backend.snapshot_cache import DataVersion
+except ImportError:
+    from snapshot_cache import DataVersion
+
+logger = logging.getLogger("salespark.live_updates")
+
+
+class LiveBroadcaster:
+    def __init__(
+        self,
+        version: DataVersion,
+        compute: Callable[[], Dict[str, Any]],
+        *,
+        event: str = "dashboard",
+        min_interval: float = 0.25,
+        keepalive: float = 15.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self._version = version
+        self._compute = compute
+        self.event = event
+        self.min_interval = min_interval
+        self.keepalive = keepalive
+        self.poll_interval = poll_interval
+        self._subscribers: Set["asyncio.Queue[str]"] = set()
+        self._frame: Optional[Tuple[int, str]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._compute_lock: Optional[asyncio.Lock] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stats: Counter = Counter()
+        version.add_listener(self._on_bump)
+
+    def _on_bump(self, _value: int) -> None:
+        # Runs on whichever thread wrote; only hand a wake-up to the loop.
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._compute_lock = asyncio.Lock()
+        self._task = asyncio.ensure_future(self._publish())
+
+    async def _current_frame(self) -> Tuple[int, str]:
+        async with self._compute_lock:
+            # Tag with the version read *before* computing; a write that lands
+            # mid-compute wakes the publisher again and gets its own frame.
+            version = await self._version.value_async()
+            if self._frame is None or self._frame[0] != version:
+                payload = await run_in_threadpool(self._compute)
+                self._stats["computes"] += 1
+                data = json.dumps(dict(payload, version=version), default=str)
+                self._frame = (version, f"id: {version}\nevent: {self.event}\ndata: {data}\n\n")
+            return self._frame
+
+    async def _publish(self) -> None:
+        published = await self._version.value_async()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                if self._subscribers:
+                    # Calls _on_bump (setting _wake) if another process wrote.
+                    try:
+                        await run_in_threadpool(self._version.refresh)
+                        self._stats["polls"] += 1
+                    except Exception as exc:
+                        logger.warning("[live] Data version poll failed: %s", exc)
+                continue
+            await asyncio.sleep(self.min_interval)
+            self._wake.clear()
+            if not self._subscribers or await self._version.value_async() == published:
+                continue
+            try:
+                published, frame = await self._current_frame()
+            except Exception as exc:
+                logger.warning("[live] Dashboard recompute failed: %s", exc)
+                continue
+            for queue in list(self._subscribers):
+                if queue.full():
+                    queue.get_nowait()
+                    self._stats["skipped"] += 1
+                queue.put_nowait(frame)
+            self._stats["publishes"] += 1
+
+    async def stream(self) -> AsyncIterator[str]:
+        """SSE frames for one subscriber: the current payload, then one per change."""
+        self._ensure_started()
+        queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        self._stats["connections"] += 1
+        try:
+            yield "retry: 1000\n\n"
+            _, last = await self._current_frame()
+            yield last
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if frame is not last:
+                    last = frame
+                    yield frame
+        finally:
+            self._subscribers.discard(queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            subscribers=len(self._subscribers),
+            frame_version=self._frame[0] if self._frame else None,
+            data_version=self._version.value,
+        )
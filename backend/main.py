@@ -1,23 +1,30 @@
 from datetime import datetime, timedelta
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
-import hashlib
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+import asyncio
+import base64
+import contextvars
+import itertools
 import json
 import logging
 import os
 import random
 import re
 import sqlite3
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from dotenv import load_dotenv
+try:
+    from backend.groq_clients import load_env
+except ImportError:
+    from groq_clients import load_env
 
-load_dotenv()
+# Before any os.getenv call here or in the modules imported below.
+load_env()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,19 +34,203 @@ logging.basicConfig(
 logger = logging.getLogger("salespark")
 
 try:
-    from backend.ai_service import generate_chat_response
+    from backend.ai_service import generate_chat_response, generate_chat_response_async, stream_chat_response
+except ImportError:
+    from ai_service import generate_chat_response, generate_chat_response_async, stream_chat_response
+
+try:
+    from backend.phase2_ai import generate_json_result, generate_json_result_async
+except ImportError:
+    from phase2_ai import generate_json_result, generate_json_result_async
+
+try:
+    from backend.ai_cache import SOURCE_FALLBACK, SOURCE_MODEL, AICacheStats, CachedOutput, TTLCache
+except ImportError:
+    from ai_cache import SOURCE_FALLBACK, SOURCE_MODEL, AICacheStats, CachedOutput, TTLCache
+
+try:
+    from backend.cache_keys import cache_key
+except ImportError:
+    from cache_keys import cache_key
+
+try:
+    from backend.circuit_breaker import groq_breaker
+except ImportError:
+    from circuit_breaker import groq_breaker
+
+try:
+    from backend.deadlines import detach, latency_budget, record_expired, remaining_budget
+    from backend.deadlines import stats as deadline_stats
+except ImportError:
+    from deadlines import detach, latency_budget, record_expired, remaining_budget
+    from deadlines import stats as deadline_stats
+
+try:
+    from backend.columnar import columnar_response, from_records, parse_format, transpose, tuple_cursor
+except ImportError:
+    from columnar import columnar_response, from_records, parse_format, transpose, tuple_cursor
+
+try:
+    from backend.conditional_get import ConditionalGetMiddleware, VersionValidators
+except ImportError:
+    from conditional_get import ConditionalGetMiddleware, VersionValidators
+
+try:
+    from backend.db_pool import ConnectionPool
+except ImportError:
+    from db_pool import ConnectionPool
+
+try:
+    from backend.jobs import JobManager, QueueFullError
+except ImportError:
+    from jobs import JobManager, QueueFullError
+
+try:
+    from backend.lead_import import detect_format, iter_records
+except ImportError:
+    from lead_import import detect_format, iter_records
+
+try:
+    from backend.live_updates import LiveBroadcaster
+except ImportError:
+    from live_updates import LiveBroadcaster
+
+try:
+    from backend.market_search import build_market_search
+except ImportError:
+    from market_search import build_market_search
+
+try:
+    from backend.migrations import apply_migrations, load_schema
+except ImportError:
+    from migrations import apply_migrations, load_schema
+
+try:
+    from backend.pipeline_stats import (
+        PIPELINE_STATS_COLUMNS,
+        average_score,
+        compute_pipeline_stats,
+        read_pipeline_stats,
+        rebuild_pipeline_stats,
+    )
+except ImportError:
+    from pipeline_stats import (
+        PIPELINE_STATS_COLUMNS,
+        average_score,
+        compute_pipeline_stats,
+        read_pipeline_stats,
+        rebuild_pipeline_stats,
+    )
+
+try:
+    from backend.revalidation import PRIORITY_FALLBACK, PRIORITY_STALE, Revalidator
+except ImportError:
+    from revalidation import PRIORITY_FALLBACK, PRIORITY_STALE, Revalidator
+
+try:
+    from backend.scoring import batch_summary, category_for_score, recommendation_for_category, score_lead_formula, score_leads_batch
 except ImportError:
-    from ai_service import generate_chat_response
+    from scoring import batch_summary, category_for_score, recommendation_for_category, score_lead_formula, score_leads_batch
 
 try:
-    from backend.phase2_ai import generate_json
+    from backend.static_assets import StaticBundle
 except ImportError:
-    from phase2_ai import generate_json
+    from static_assets import StaticBundle
+
+try:
+    from backend.table_export import EXPORT_FORMATS, stream_export
+except ImportError:
+    from table_export import EXPORT_FORMATS, stream_export
+
+try:
+    from backend.write_behind import WriteBehindQueue
+except ImportError:
+    from write_behind import WriteBehindQueue
+
+try:
+    from backend.single_flight import SingleFlight
+except ImportError:
+    from single_flight import SingleFlight
+
+try:
+    from backend.snapshot_cache import DataVersion, VersionedCache, read_data_version, touch_data_version
+except ImportError:
+    from snapshot_cache import DataVersion, VersionedCache, read_data_version, touch_data_version
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DB_PATH = os.path.join(PROJECT_ROOT, "backend", "sales.db")
 
-app = FastAPI()
+_write_pool = ConnectionPool(DB_PATH, size=int(os.getenv("DB_POOL_SIZE", "8")))
+_read_pool = ConnectionPool(DB_PATH, size=int(os.getenv("DB_READ_POOL_SIZE", "16")), readonly=True)
+
+
+def _read_shared_data_version() -> Tuple[int, float]:
+    conn = get_db(readonly=True)
+    try:
+        return read_data_version(conn.cursor())
+    finally:
+        conn.close()
+
+
+# Moved by triggers on every write, from any worker or process; read
+# endpoints are memoized per version. DATA_VERSION_MAX_AGE > 0 trades up to
+# that many seconds of cross-worker staleness for fewer version reads.
+data_version = DataVersion(_read_shared_data_version, max_age=float(os.getenv("DATA_VERSION_MAX_AGE", "0")))
+snapshot_cache = VersionedCache(data_version)
+
+# Two-tier AI output cache: bounded in-memory LRU in front of ai_outputs.
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2048"))
+AI_OUTPUTS_MAX_ROWS = int(os.getenv("AI_OUTPUTS_MAX_ROWS", "50000"))
+AI_OUTPUTS_PRUNE_EVERY = 200
+ai_cache_stats = AICacheStats()
+ai_memory_cache = TTLCache(AI_CACHE_MAX_ENTRIES, ai_cache_stats)
+_ai_output_saves = itertools.count(1)
+# One upstream LLM call per (feature, input_hash) at a time.
+ai_flights = SingleFlight()
+
+market_search = build_market_search()
+
+# Latency SLO for interactive AI routes; slower LLM answers land in the cache later.
+AI_LATENCY_BUDGET = float(os.getenv("AI_LATENCY_BUDGET", "1.5"))
+
+# Read endpoints whose body depends only on data_version (and the URL).
+analytics_validators = VersionValidators(
+    data_version,
+    ("/dashboard", "/alerts", "/segments", "/trends/sales", "/recommendations", "/weekly-report", "/actions/next", "/leads"),
+    cache_control=os.getenv("ANALYTICS_CACHE_CONTROL", "public, no-cache"),
+)
+
+# Filled in by lifespan(); reported by /stats/cache and benchmarks/bench_startup.py.
+startup_timings: Dict[str, float] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Per-process startup and shutdown. Importing this module does no I/O:
+    the database is migrated and seeded here, once per process (and, thanks
+    to the migration lock, once per database), not as an import side effect.
+    """
+    started = time.perf_counter()
+    for name, step in (("init_db", init_db), ("static_bundle", static_bundle.build)):
+        step_started = time.perf_counter()
+        await run_in_threadpool(step)
+        startup_timings[f"{name}_ms"] = round((time.perf_counter() - step_started) * 1000, 2)
+    await job_manager.start()
+    startup_timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info("[startup] Ready in %.1fms %s", startup_timings["total_ms"], startup_timings)
+    try:
+        yield
+    finally:
+        # Jobs first: a finishing job may still queue interaction writes.
+        await job_manager.stop()
+        interaction_writer.stop()
+        await market_search.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+# Added before CORS so 304s still get the CORS headers.
+app.add_middleware(ConditionalGetMiddleware, validators=analytics_validators)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -48,9 +239,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/css", StaticFiles(directory=os.path.join(PROJECT_ROOT, "css")), name="css")
-app.mount("/js", StaticFiles(directory=os.path.join(PROJECT_ROOT, "js")), name="js")
-app.mount("/assets", StaticFiles(directory=os.path.join(PROJECT_ROOT, "assets")), name="assets")
+HTML_PAGES = (
+    "index.html",
+    "tools.html",
+    "prediction.html",
+    "market_intelligence.html",
+    "sales_copilot.html",
+    "leads.html",
+)
+static_bundle = StaticBundle(PROJECT_ROOT, ("css", "js", "assets"), HTML_PAGES)
+
+
+# HEAD too: proxies and health checks probe static files with it.
+@app.api_route("/css/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+@app.api_route("/js/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+@app.api_route("/assets/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def static_asset(request: Request, v: Optional[str] = None):
+    return static_bundle.response(request.url.path.lstrip("/"), request.headers, version=v)
+
 
 class CampaignRequest(BaseModel):
     product: str
@@ -64,9 +270,13 @@ class PitchRequest(BaseModel):
     target: str
 
 
+# SQLite INTEGER is a signed 64-bit value; anything larger fails at insert time.
+SQLITE_INTEGER_MIN, SQLITE_INTEGER_MAX = -(2**63), 2**63 - 1
+
+
 class ScoreRequest(BaseModel):
     company: str
-    budget: int
+    budget: int = Field(ge=SQLITE_INTEGER_MIN, le=SQLITE_INTEGER_MAX)
     interest: int = Field(ge=1, le=10)
     industry: Optional[str] = None
     region: Optional[str] = None
@@ -76,6 +286,11 @@ class ScoreRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class BatchScoreRequest(BaseModel):
+    budgets: List[int]
+    interests: List[int]
+
+
 class AnalysisRequest(BaseModel):
     industry: str
     product: Optional[str] = ""
@@ -118,110 +333,24 @@ class MarketAnalysisRequest(BaseModel):
     time_horizon: str = "Mid"
 
 
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Known-good column sets per table, loaded once after migrations run.
+SCHEMA: Dict[str, frozenset] = {}
 
 
-def ensure_column(cur: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
-    columns = {row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall()}
-    if column not in columns:
-        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+def get_db(readonly: bool = False) -> sqlite3.Connection:
+    """Check a connection out of the pool; ``conn.close()`` hands it back."""
+    return (_read_pool if readonly else _write_pool).acquire()
 
 
 def init_db() -> None:
+    global SCHEMA
     conn = get_db()
     cur = conn.cursor()
 
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS campaigns (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product TEXT,
-            audience TEXT,
-            platform TEXT,
-            goal TEXT,
-            objective TEXT,
-            theme TEXT,
-            marketing_strategy TEXT,
-            messaging_approach TEXT,
-            cta TEXT,
-            expected_outcome TEXT,
-            outcome TEXT,
-            ai_insight TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS leads (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company TEXT,
-            budget INTEGER,
-            interest INTEGER,
-            score INTEGER,
-            category TEXT,
-            industry TEXT,
-            region TEXT,
-            contact_name TEXT,
-            contact_email TEXT,
-            deal_stage TEXT DEFAULT 'Prospecting',
-            last_contacted TIMESTAMP,
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS interactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            lead_id INTEGER REFERENCES leads(id),
-            action_type TEXT,
-            content TEXT,
-            scheduled_for TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS ai_outputs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            feature TEXT NOT NULL,
-            input_hash TEXT NOT NULL,
-            output TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(feature, input_hash)
-        )
-        """
-    )
-
-    ensure_column(cur, "campaigns", "audience", "TEXT")
-    ensure_column(cur, "campaigns", "objective", "TEXT")
-    ensure_column(cur, "campaigns", "theme", "TEXT")
-    ensure_column(cur, "campaigns", "marketing_strategy", "TEXT")
-    ensure_column(cur, "campaigns", "messaging_approach", "TEXT")
-    ensure_column(cur, "campaigns", "cta", "TEXT")
-    ensure_column(cur, "campaigns", "expected_outcome", "TEXT")
-    ensure_column(cur, "campaigns", "outcome", "TEXT")
-    ensure_column(cur, "campaigns", "ai_insight", "TEXT")
-
-    ensure_column(cur, "leads", "industry", "TEXT")
-    ensure_column(cur, "leads", "region", "TEXT")
-    ensure_column(cur, "leads", "contact_name", "TEXT")
-    ensure_column(cur, "leads", "contact_email", "TEXT")
-    ensure_column(cur, "leads", "deal_stage", "TEXT DEFAULT 'Prospecting'")
-    ensure_column(cur, "leads", "last_contacted", "TIMESTAMP")
-    ensure_column(cur, "leads", "notes", "TEXT")
-
-    # Backward-compatible interactions schema migration
-    ensure_column(cur, "interactions", "content", "TEXT")
-    ensure_column(cur, "interactions", "scheduled_for", "TEXT")
-    ensure_column(cur, "interactions", "notes", "TEXT")
+    apply_migrations(conn)
 
+    # Under the write lock, so workers booting together seed only once.
+    cur.execute("BEGIN IMMEDIATE")
     count = cur.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
     if count == 0:
         seed_data = [
@@ -254,10 +383,38 @@ def init_db() -> None:
         )
 
     conn.commit()
+    SCHEMA = load_schema(cur)
     conn.close()
 
 
-init_db()
+def check_pipeline_stats(repair: bool = True) -> Dict[str, Any]:
+    """
+    Consistency checker for the trigger-maintained pipeline_stats row.
+    Recomputes every aggregate from scratch, reports any drift and, when
+    ``repair`` is set, rewrites the row with the recomputed values.
+    """
+    conn = get_db()
+    cur = conn.cursor()
+    try:
+        maintained = read_pipeline_stats(cur)
+        actual = compute_pipeline_stats(cur)
+        drift = {
+            col: {"maintained": maintained[col], "actual": actual[col]}
+            for col in PIPELINE_STATS_COLUMNS
+            if maintained[col] != actual[col]
+        }
+        if repair:
+            rebuild_pipeline_stats(cur)
+            if drift:
+                touch_data_version(cur)
+            conn.commit()
+    finally:
+        conn.close()
+    if drift and repair:
+        data_version.bump()
+    if drift:
+        logger.warning("[pipeline_stats] Drift detected: %s", drift)
+    return {"consistent": not drift, "repaired": bool(drift) and repair, "drift": drift, "stats": actual}
 
 
 INDUSTRY_BASELINES = {
@@ -283,112 +440,217 @@ TIME_MULTIPLIERS = {
     "Long": {"demand": 1.18, "opportunity": 1.26},
 }
 
-def category_for_score(score: int) -> str:
-    if score >= 80:
-        return "Hot"
-    if score >= 55:
-        return "Warm"
-    return "Cold"
-
-
-def score_lead_formula(budget: int, interest: int) -> int:
-    score = 20
-    if budget >= 50000:
-        score += 40
-    elif budget >= 10000:
-        score += 30
-    elif budget >= 5000:
-        score += 15
-    else:
-        score += 5
-
-    if interest >= 9:
-        score += 40
-    elif interest >= 7:
-        score += 30
-    elif interest >= 5:
-        score += 15
-    else:
-        score += 5
-
-    return min(100, score)
-
-
-def recommendation_for_category(category: str) -> str:
-    if category == "Hot":
-        return "Schedule a discovery call within 3 days"
-    if category == "Warm":
-        return "Send a personalized nurture email with a relevant case study"
-    return "Add to monthly newsletter for long-term brand awareness"
-
-
-def serialize_rows(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
-    return [dict(row) for row in rows]
-
-
-def make_hash(payload: Dict[str, Any]) -> str:
-    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
-
-
-def get_cached_output(feature: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    conn = get_db()
+def _load_cached_output(feature: str, input_hash: str) -> Optional[CachedOutput]:
+    conn = get_db(readonly=True)
     cur = conn.cursor()
     row = cur.execute(
-        "SELECT output FROM ai_outputs WHERE feature = ? AND input_hash = ?",
-        (feature, make_hash(payload)),
+        """
+        SELECT output, source, CAST(strftime('%s', created_at) AS INTEGER) AS created_epoch
+        FROM ai_outputs WHERE feature = ? AND input_hash = ?
+        """,
+        (feature, input_hash),
     ).fetchone()
     conn.close()
     if not row:
         return None
     try:
-        return json.loads(row["output"])
+        data = json.loads(row["output"])
     except json.JSONDecodeError:
         return None
+    if not data:
+        return None
+    return CachedOutput(data, row["source"] or SOURCE_MODEL, float(row["created_epoch"] or 0))
 
 
-def save_cached_output(feature: str, payload: Dict[str, Any], data: Dict[str, Any]) -> None:
+def get_cached_output(feature: str, payload: Dict[str, Any]) -> Optional[CachedOutput]:
+    """Cached entry for this input (fresh or stale), or None on a true miss."""
+    input_hash = cache_key(feature, payload)
+    cached = ai_memory_cache.get(feature, input_hash)
+    if cached is not None:
+        ai_cache_stats.incr(feature, "memory_hits")
+    else:
+        cached = _load_cached_output(feature, input_hash)
+        if cached is None:
+            ai_cache_stats.incr(feature, "misses")
+            return None
+        ai_cache_stats.incr(feature, "db_hits")
+        ai_memory_cache.set(feature, input_hash, cached)
+
+    if cached.source != SOURCE_MODEL:
+        ai_cache_stats.incr(feature, "fallback_hits")
+    elif cached.is_stale(feature):
+        ai_cache_stats.incr(feature, "stale_hits")
+    return cached._replace(data=dict(cached.data))
+
+
+def save_cached_output(feature: str, payload: Dict[str, Any], data: Dict[str, Any], source: str = SOURCE_MODEL) -> None:
+    input_hash = cache_key(feature, payload)
     conn = get_db()
     cur = conn.cursor()
     cur.execute(
         """
-        INSERT INTO ai_outputs (feature, input_hash, output)
-        VALUES (?, ?, ?)
-        ON CONFLICT(feature, input_hash) DO UPDATE SET output = excluded.output, created_at = CURRENT_TIMESTAMP
+        INSERT INTO ai_outputs (feature, input_hash, output, source)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(feature, input_hash) DO UPDATE SET
+            output = excluded.output, source = excluded.source, created_at = CURRENT_TIMESTAMP
         """,
-        (feature, make_hash(payload), json.dumps(data)),
+        (feature, input_hash, json.dumps(data), source),
     )
     conn.commit()
     conn.close()
+    ai_memory_cache.set(feature, input_hash, CachedOutput(dict(data), source, time.time()))
+    if next(_ai_output_saves) % AI_OUTPUTS_PRUNE_EVERY == 0:
+        prune_ai_outputs()
 
 
-def ai_or_fallback(feature: str, payload: Dict[str, Any], system_prompt: str, user_prompt: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
-    cached = get_cached_output(feature, payload)
-    if cached:
-        return cached
-    result = generate_json(
+def _refresh_ai_output(feature: str, payload: Dict[str, Any], system_prompt: str, user_prompt: str, fallback: Dict[str, Any]) -> None:
+    result = generate_json_result(
         feature=feature,
         system_prompt=system_prompt,
         user_prompt=user_prompt,
         fallback=fallback,
     )
-    save_cached_output(feature, payload, result)
-    return result
+    # A failed refresh keeps the entry we already have.
+    if result.from_model:
+        save_cached_output(feature, payload, result.data)
 
 
-def get_pipeline_snapshot() -> Dict[str, Any]:
+ai_revalidator = Revalidator(
+    _refresh_ai_output,
+    name="ai-revalidator",
+    workers=int(os.getenv("AI_REVALIDATE_WORKERS", "2")),
+    cooldown=float(os.getenv("AI_REVALIDATE_COOLDOWN", "60")),
+)
+
+
+def schedule_refresh(feature: str, payload: Dict[str, Any], cached: CachedOutput, system_prompt: str, user_prompt: str, fallback: Dict[str, Any]) -> None:
+    priority = PRIORITY_STALE if cached.source == SOURCE_MODEL else PRIORITY_FALLBACK
+    ai_revalidator.schedule((feature, cache_key(feature, payload)), priority, feature, payload, system_prompt, user_prompt, fallback)
+
+
+def prune_ai_outputs(max_rows: int = AI_OUTPUTS_MAX_ROWS) -> int:
+    """Trim ai_outputs to the newest ``max_rows`` rows (oldest created_at first)."""
+    overflow = """
+        SELECT id, feature FROM ai_outputs
+        ORDER BY created_at DESC, id DESC
+        LIMIT -1 OFFSET ?
+    """
     conn = get_db()
     cur = conn.cursor()
-    total_leads = cur.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
-    hot_leads = cur.execute("SELECT COUNT(*) FROM leads WHERE score >= 80").fetchone()[0]
-    warm_leads = cur.execute("SELECT COUNT(*) FROM leads WHERE score >= 55 AND score < 80").fetchone()[0]
-    cold_leads = cur.execute("SELECT COUNT(*) FROM leads WHERE score < 55").fetchone()[0]
-    avg_raw = cur.execute("SELECT AVG(score) FROM leads").fetchone()[0]
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        evicted = cur.execute(f"SELECT feature, COUNT(*) FROM ({overflow}) GROUP BY feature", (max_rows,)).fetchall()
+        if evicted:
+            cur.execute(f"DELETE FROM ai_outputs WHERE id IN (SELECT id FROM ({overflow}))", (max_rows,))
+        conn.commit()
+    finally:
+        conn.close()
+    total = 0
+    for feature, count in evicted:
+        ai_cache_stats.incr(feature, "db_evictions", count)
+        total += count
+    if total:
+        logger.info("Evicted %d ai_outputs rows (cap %d)", total, max_rows)
+    return total
+
+
+def ai_or_fallback(feature: str, payload: Dict[str, Any], system_prompt: str, user_prompt: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stale-while-revalidate: fresh hits and stale hits return immediately (stale
+    ones are refreshed in the background); only a true miss waits for the LLM.
+    """
+    cached = get_cached_output(feature, payload)
+    if cached is not None:
+        if cached.is_stale(feature):
+            schedule_refresh(feature, payload, cached, system_prompt, user_prompt, fallback)
+        return cached.data
+    input_hash = cache_key(feature, payload)
+
+    def generate() -> Dict[str, Any]:
+        # A flight that finished between our cache miss and now has already
+        # populated the memory tier; don't pay for a second call.
+        landed = ai_memory_cache.get(feature, input_hash)
+        if landed is not None:
+            return dict(landed.data)
+        result = generate_json_result(
+            feature=feature,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            fallback=fallback,
+        )
+        # Deterministic fallbacks (LLM down, circuit open, bad output) are
+        # stored marked as such: always stale, first in line for a refresh.
+        save_cached_output(feature, payload, result.data, SOURCE_MODEL if result.from_model else SOURCE_FALLBACK)
+        return result.data
+
+    result, shared = ai_flights.do((feature, input_hash), generate, group=feature)
+    return dict(result) if shared else result
+
+
+async def ai_or_fallback_async(feature: str, payload: Dict[str, Any], system_prompt: str, user_prompt: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ai_or_fallback for async routes: the LLM call is awaited, SQLite runs in the
+    threadpool. Inside a @latency_budget route, ``fallback`` is served once the
+    budget runs out and the generation finishes (and is cached) in the background.
+    """
+    cached = await run_in_threadpool(get_cached_output, feature, payload)
+    if cached is not None:
+        if cached.is_stale(feature):
+            schedule_refresh(feature, payload, cached, system_prompt, user_prompt, fallback)
+        return cached.data
+    input_hash = cache_key(feature, payload)
+
+    async def generate() -> Dict[str, Any]:
+        landed = ai_memory_cache.get(feature, input_hash)
+        if landed is not None:
+            return dict(landed.data)
+        result = await generate_json_result_async(
+            feature=feature,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            fallback=fallback,
+        )
+        source = SOURCE_MODEL if result.from_model else SOURCE_FALLBACK
+        await run_in_threadpool(save_cached_output, feature, payload, result.data, source)
+        return result.data
+
+    budget = remaining_budget()
+    if budget is None:
+        result, shared = await ai_flights.do_async((feature, input_hash), generate, group=feature)
+        return dict(result) if shared else result
+
+    # Run the flight as its own task so timing out this request doesn't cancel it.
+    flight = asyncio.ensure_future(ai_flights.do_async((feature, input_hash), generate, group=feature))
+    try:
+        result, shared = await asyncio.wait_for(asyncio.shield(flight), timeout=budget)
+    except asyncio.TimeoutError:
+        record_expired(feature)
+        detach(flight, feature)
+        logger.info("[deadline] %s exceeded its latency budget; serving fallback", feature)
+        return dict(fallback)
+    return dict(result) if shared else result
+
+
+@snapshot_cache.memoize("pipeline_snapshot")
+def get_pipeline_snapshot() -> Dict[str, Any]:
+    conn = get_db(readonly=True)
+    snapshot = pipeline_snapshot_from(conn.cursor())
+    conn.close()
+    return snapshot
+
+
+def pipeline_snapshot_from(cur: sqlite3.Cursor) -> Dict[str, Any]:
+    stats = read_pipeline_stats(cur)
+    total_leads = stats["total_leads"]
+    hot_leads = stats["hot_leads"]
+    warm_leads = stats["warm_leads"]
+    cold_leads = stats["cold_leads"]
+    avg_raw = average_score(stats)
     avg_score = round(avg_raw, 1) if avg_raw is not None else 0.0
-    total_campaigns = cur.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+    total_campaigns = stats["total_campaigns"]
     top_rows = cur.execute(
         "SELECT id, company, category, score, budget FROM leads ORDER BY score DESC, created_at DESC LIMIT 5"
     ).fetchall()
-    conn.close()
 
     if total_leads == 0:
         health = "Empty"
@@ -412,7 +674,7 @@ def get_pipeline_snapshot() -> Dict[str, Any]:
 
 
 def get_market_context() -> Dict[str, Any]:
-    conn = get_db()
+    conn = get_db(readonly=True)
     cur = conn.cursor()
     industries = [row[0] for row in cur.execute("SELECT DISTINCT industry FROM leads WHERE industry IS NOT NULL AND TRIM(industry) != '' ORDER BY industry").fetchall()]
     regions = [row[0] for row in cur.execute("SELECT DISTINCT region FROM leads WHERE region IS NOT NULL AND TRIM(region) != '' ORDER BY region").fetchall()]
@@ -425,45 +687,8 @@ def get_market_context() -> Dict[str, Any]:
     }
 
 
-def try_market_search(industry: str, region: str, product: str = "") -> str:
-    tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
-    serpapi_key = os.getenv("SERPAPI_API_KEY", "").strip()
-    query = f"{industry} market demand competition {region} {product}".strip()
-
-    if tavily_key:
-        try:
-            payload = json.dumps({
-                "api_key": tavily_key,
-                "query": query,
-                "search_depth": "basic",
-                "max_results": 3,
-            }).encode("utf-8")
-            req = Request(
-                "https://api.tavily.com/search",
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with urlopen(req, timeout=6) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-            results = data.get("results", [])[:3]
-            if results:
-                return " ".join(f"{item.get('title', '')}: {item.get('content', '')}" for item in results)
-        except Exception as exc:
-            logger.warning("[market] Tavily lookup failed: %s", exc)
-
-    if serpapi_key:
-        try:
-            params = urlencode({"engine": "google", "q": query, "api_key": serpapi_key})
-            with urlopen(f"https://serpapi.com/search.json?{params}", timeout=6) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-            organic = data.get("organic_results", [])[:3]
-            if organic:
-                return " ".join(f"{item.get('title', '')}: {item.get('snippet', '')}" for item in organic)
-        except Exception as exc:
-            logger.warning("[market] SerpAPI lookup failed: %s", exc)
-
-    return ""
+async def try_market_search(industry: str, region: str, product: str = "") -> str:
+    return await market_search.search(industry, region, product)
 
 
 def build_demand_trend(demand_score: int, horizon: str, avg_score: float) -> List[int]:
@@ -493,35 +718,81 @@ def normalize_channels(channels: Any, default_channels: Dict[str, int]) -> Dict[
         normalized[key] = max(0, min(100, val))
     return normalized
 
-def log_interaction(lead_id: int, action_type: str, content: Dict[str, Any], scheduled_for: Optional[str] = None) -> None:
+def _flush_interactions(batch: List[tuple]) -> None:
+    cols = SCHEMA["interactions"]
     conn = get_db()
-    cur = conn.cursor()
     try:
-        cols = {row[1] for row in cur.execute("PRAGMA table_info(interactions)").fetchall()}
-        payload = json.dumps(content)
-
-        if {"content", "scheduled_for"}.issubset(cols):
-            cur.execute(
-                "INSERT INTO interactions (lead_id, action_type, content, scheduled_for) VALUES (?, ?, ?, ?)",
-                (lead_id, action_type, payload, scheduled_for),
-            )
-        elif "notes" in cols:
-            cur.execute(
-                "INSERT INTO interactions (lead_id, action_type, notes) VALUES (?, ?, ?)",
-                (lead_id, action_type, payload),
-            )
-        else:
-            cur.execute(
-                "INSERT INTO interactions (lead_id, action_type) VALUES (?, ?)",
-                (lead_id, action_type),
-            )
-
-        conn.commit()
+        with conn:
+            if {"content", "scheduled_for"}.issubset(cols):
+                conn.executemany(
+                    "INSERT INTO interactions (lead_id, action_type, content, scheduled_for) VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+            elif "notes" in cols:
+                conn.executemany(
+                    "INSERT INTO interactions (lead_id, action_type, notes) VALUES (?, ?, ?)",
+                    [(lead_id, action_type, payload) for lead_id, action_type, payload, _ in batch],
+                )
+            else:
+                conn.executemany(
+                    "INSERT INTO interactions (lead_id, action_type) VALUES (?, ?)",
+                    [(lead_id, action_type) for lead_id, action_type, _, _ in batch],
+                )
     finally:
         conn.close()
+    data_version.bump()
+
+
+interaction_writer: WriteBehindQueue[tuple] = WriteBehindQueue(
+    _flush_interactions,
+    name="interaction-writer",
+    max_batch=int(os.getenv("INTERACTION_FLUSH_BATCH", "500")),
+    max_delay=float(os.getenv("INTERACTION_FLUSH_INTERVAL", "0.25")),
+    max_pending=int(os.getenv("INTERACTION_BUFFER_SIZE", "10000")),
+)
+
+
+# Bounded worker pool for POST /jobs/{feature}; handlers are registered below the routes.
+job_manager = JobManager(
+    get_db,
+    workers=int(os.getenv("JOB_WORKERS", "4")),
+    max_queued=int(os.getenv("JOB_QUEUE_SIZE", "100")),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", "3600")),
+    lease=float(os.getenv("JOB_LEASE_SECONDS", "60")),
+)
+
+
+async def log_interaction(lead_id: int, action_type: str, content: Dict[str, Any], scheduled_for: Optional[str] = None) -> None:
+    """
+    Queue an interaction row; the write-behind flusher persists it in a batch.
+    When the buffer is full, the backpressure wait (and inline write) happens
+    on a worker thread, never on the event loop.
+    """
+    item = (lead_id, action_type, json.dumps(content), scheduled_for)
+    if not interaction_writer.offer(item):
+        await run_in_threadpool(interaction_writer.submit, item)
+
+
+def _insert_campaign(values: tuple) -> None:
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO campaigns (
+            product, audience, platform, goal, objective, theme,
+            marketing_strategy, messaging_approach, cta, expected_outcome,
+            outcome, ai_insight, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        values,
+    )
+    conn.commit()
+    conn.close()
+    data_version.bump()
+
 
 @app.post("/campaigns")
-def generate_campaign(req: CampaignRequest):
+async def generate_campaign(req: CampaignRequest):
     payload = {
         "product": req.product.strip(),
         "audience": (req.audience or "General buyers").strip(),
@@ -536,7 +807,7 @@ def generate_campaign(req: CampaignRequest):
         "expected_outcome": f"Improved {payload['goal'].lower()} performance from a more targeted {payload['platform']} campaign.",
         "ai_insight": f"{payload['platform']} audiences respond best when the first message clearly links {payload['product']} to measurable business impact.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "campaign_generator",
         payload,
         "Return only JSON with keys: theme, marketing_strategy, messaging_approach, cta, expected_outcome, ai_insight. Keep each value concise and business-ready.",
@@ -546,24 +817,14 @@ def generate_campaign(req: CampaignRequest):
     objective = f"Launch a {payload['platform']} campaign for {payload['product']} focused on {payload['goal'].lower()}."
     outcome = ai_data["expected_outcome"]
 
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO campaigns (
-            product, audience, platform, goal, objective, theme,
-            marketing_strategy, messaging_approach, cta, expected_outcome,
-            outcome, ai_insight, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+    await run_in_threadpool(
+        _insert_campaign,
         (
             payload["product"], payload["audience"], payload["platform"], payload["goal"], objective,
             ai_data["theme"], ai_data["marketing_strategy"], ai_data["messaging_approach"], ai_data["cta"],
             ai_data["expected_outcome"], outcome, ai_data["ai_insight"], datetime.utcnow().isoformat(),
         ),
     )
-    conn.commit()
-    conn.close()
 
     return {
         "objective": objective,
@@ -578,7 +839,7 @@ def generate_campaign(req: CampaignRequest):
 
 
 @app.post("/pitch")
-def generate_pitch(req: PitchRequest):
+async def generate_pitch(req: PitchRequest):
     payload = {"product": req.product.strip(), "target": req.target.strip()}
     fallback = {
         "opening_hook": f"{payload['target']} are under pressure to deliver more revenue with less manual work.",
@@ -587,7 +848,7 @@ def generate_pitch(req: PitchRequest):
         "objection_handling": "Implementation is lightweight, ROI is visible quickly, and adoption is easier than replacing a full sales stack.",
         "closing_statement": "If this could improve pipeline velocity in the next 30 days, would you be open to a short walkthrough?",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "sales_pitch",
         payload,
         "Return only JSON with keys: opening_hook, problem_framing, product_positioning, objection_handling, closing_statement.",
@@ -608,8 +869,26 @@ def generate_pitch(req: PitchRequest):
     }
 
 
+LEAD_INSERT_SQL = """
+    INSERT INTO leads (
+        company, budget, interest, score, category, industry, region,
+        contact_name, contact_email, deal_stage, last_contacted, notes, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _insert_lead(values: tuple) -> None:
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(LEAD_INSERT_SQL, values)
+    conn.commit()
+    conn.close()
+    data_version.bump()
+
+
 @app.post("/leads")
-def score_lead(req: ScoreRequest):
+@latency_budget(AI_LATENCY_BUDGET)
+async def score_lead(req: ScoreRequest):
     score = score_lead_formula(req.budget, req.interest)
     category = category_for_score(score)
     recommendation = recommendation_for_category(category)
@@ -626,7 +905,7 @@ def score_lead(req: ScoreRequest):
     fallback = {
         "explanation": f"This lead is {category.lower()} because the budget and interest signals combine to a score of {score}, indicating {recommendation.lower()}.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "lead_scoring_explanation",
         payload,
         "Return only JSON with key explanation. Explain why the lead score maps to Hot, Warm, or Cold in 1-2 sentences.",
@@ -634,23 +913,14 @@ def score_lead(req: ScoreRequest):
         fallback,
     )
 
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO leads (
-            company, budget, interest, score, category, industry, region,
-            contact_name, contact_email, deal_stage, last_contacted, notes, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+    await run_in_threadpool(
+        _insert_lead,
         (
             req.company.strip(), req.budget, req.interest, score, category, req.industry, req.region,
             req.contact_name, req.contact_email, req.deal_stage, datetime.utcnow().isoformat(), req.notes,
             datetime.utcnow().isoformat(),
         ),
     )
-    conn.commit()
-    conn.close()
 
     return {
         "score": score,
@@ -660,24 +930,238 @@ def score_lead(req: ScoreRequest):
     }
 
 
-@app.get("/leads")
-def get_all_leads():
-    conn = get_db()
-    cur = conn.cursor()
+LEAD_FIELDS = (
+    "id", "company", "budget", "interest", "score", "category", "industry", "region",
+    "contact_name", "contact_email", "deal_stage", "last_contacted", "notes", "created_at",
+)
+LEAD_FILTERS = ("category", "industry", "region", "deal_stage")
+LEADS_PAGE_DEFAULT = 100
+LEADS_PAGE_MAX = 1000
+
+
+def encode_lead_cursor(score: Any, created_at: Any, lead_id: int) -> str:
+    raw = json.dumps([score, created_at, lead_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_lead_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != 3:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    score, created_at, lead_id = values
+    # bool is an int subclass, but never a valid score or id.
+    if (
+        isinstance(score, bool) or not isinstance(score, (int, float))
+        or not (created_at is None or isinstance(created_at, str))
+        or isinstance(lead_id, bool) or not isinstance(lead_id, int)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def parse_lead_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(LEAD_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LEAD_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+@app.api_route("/leads", methods=["GET", "HEAD"])
+def get_all_leads(
+    limit: int = LEADS_PAGE_DEFAULT,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    industry: Optional[str] = None,
+    region: Optional[str] = None,
+    deal_stage: Optional[str] = None,
+    format: str = "rows",
+):
+    """
+    Leads ordered by score, newest first, one page at a time.
+
+    Keyset pagination on (score, created_at, id): pass ``next_cursor`` from
+    the previous page as ``cursor``. ``fields`` is a comma-separated
+    projection; filters are served by the (filter, score, created_at) indexes.
+    ``format=columnar`` returns column names once plus one array per column.
+    """
+    fmt = parse_format(format)
+    limit = max(1, min(LEADS_PAGE_MAX, limit))
+    projection = parse_lead_fields(fields)
+    filters = {"category": category, "industry": industry, "region": region, "deal_stage": deal_stage}
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column in LEAD_FILTERS:
+        if filters[column] is not None:
+            clauses.append(f"{column} = ?")
+            params.append(filters[column])
+    if cursor:
+        clauses.append("(score, created_at, id) < (?, ?, ?)")
+        params.extend(decode_lead_cursor(cursor))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    # The sort key is always selected so the next cursor can be built,
+    # even when it is not part of the requested projection.
+    select_cols = list(dict.fromkeys(projection + ["score", "created_at", "id"]))
+    position = {col: index for index, col in enumerate(select_cols)}
+    conn = get_db(readonly=True)
+    cur = tuple_cursor(conn)
     rows = cur.execute(
-        """
-        SELECT id, company, budget, interest, score, category, industry, region,
-               contact_name, contact_email, deal_stage, last_contacted, notes, created_at
+        f"""
+        SELECT {", ".join(select_cols)}
         FROM leads
-        ORDER BY score DESC, created_at DESC
-        """
+        {where}
+        ORDER BY score DESC, created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (*params, limit + 1),
     ).fetchall()
     conn.close()
-    return {"leads": serialize_rows(rows)}
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_lead_cursor(last[position["score"]], last[position["created_at"]], last[position["id"]])
+    if fmt == "columnar":
+        columns = transpose(rows, len(select_cols))
+        return columnar_response(
+            projection, [columns[position[col]] for col in projection], next_cursor=next_cursor, has_more=has_more
+        )
+    return {
+        "leads": [{col: row[position[col]] for col in projection} for row in rows],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+def _score_import_batch(batch: List[ScoreRequest]) -> List[tuple]:
+    now = datetime.utcnow().isoformat()
+    rows = []
+    for req in batch:
+        score = score_lead_formula(req.budget, req.interest)
+        rows.append(
+            (
+                req.company.strip(), req.budget, req.interest, score, category_for_score(score), req.industry, req.region,
+                req.contact_name, req.contact_email, req.deal_stage, None, req.notes, now,
+            )
+        )
+    return rows
+
+
+def _insert_import_batch(batch: List[ScoreRequest]) -> int:
+    rows = _score_import_batch(batch)
+    conn = get_db()
+    try:
+        with conn:
+            conn.executemany(LEAD_INSERT_SQL, rows)
+    finally:
+        conn.close()
+    # Per committed batch: a disconnect or a failing later batch must not
+    # leave already-committed rows behind stale memoized reads.
+    data_version.bump()
+    return len(rows)
+
+
+@app.post("/leads/import")
+async def import_leads(request: Request, format: Optional[str] = None, batch_size: int = IMPORT_BATCH_SIZE):
+    """
+    Bulk-import leads from a streamed CSV (header row required) or NDJSON body.
+
+    Rows are validated and scored like POST /leads, then written with
+    executemany, one transaction per batch. AI explanations are skipped:
+    they can be generated on demand later. Invalid rows are reported by
+    record number and do not stop the import.
+    """
+    try:
+        fmt = detect_format(format, request.headers.get("content-type", ""))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    batch_size = max(100, min(50000, batch_size))
+
+    started = time.perf_counter()
+    imported = 0
+    failed = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[ScoreRequest] = []
+
+    def record_error(number: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"record": number, "error": message})
+
+    async for number, fields, error in iter_records(request.stream(), fmt):
+        if error:
+            record_error(number, error)
+            continue
+        try:
+            batch.append(ScoreRequest(**fields))
+        except ValidationError as exc:
+            record_error(number, "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()))
+            continue
+        if len(batch) >= batch_size:
+            imported += await run_in_threadpool(_insert_import_batch, batch)
+            batch = []
+    if batch:
+        imported += await run_in_threadpool(_insert_import_batch, batch)
+
+    elapsed = time.perf_counter() - started
+    logger.info("[import] %d leads imported, %d failed in %.2fs (%s)", imported, failed, elapsed, fmt)
+    return {
+        "format": fmt,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round((imported + failed) / elapsed, 1) if elapsed > 0 else None,
+        "explanations": "skipped",
+    }
+
+
+BATCH_SCORE_MAX_ROWS = 1_000_000
+
+
+@app.post("/leads/score-batch")
+def score_leads_dry_run(req: BatchScoreRequest):
+    """Dry-run scoring of up to 1M leads in one vectorized pass; nothing is persisted."""
+    if len(req.budgets) != len(req.interests):
+        raise HTTPException(status_code=422, detail="budgets and interests must have the same length")
+    if len(req.budgets) > BATCH_SCORE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_SCORE_MAX_ROWS} rows per batch")
+    if req.interests and (min(req.interests) < 1 or max(req.interests) > 10):
+        raise HTTPException(status_code=422, detail="interests must be between 1 and 10")
+
+    started = time.perf_counter()
+    scores, categories, _ = score_leads_batch(req.budgets, req.interests)
+    elapsed = time.perf_counter() - started
+    return {
+        "count": len(scores),
+        "scores": scores,
+        "categories": categories,
+        # Recommendations depend only on the category; send each text once.
+        "recommendations": {category: recommendation_for_category(category) for category in ("Hot", "Warm", "Cold")},
+        "summary": batch_summary(categories),
+        "elapsed_ms": round(elapsed * 1000, 2),
+    }
 
 
 @app.post("/market")
-def market_analysis_tool(req: AnalysisRequest):
+async def market_analysis_tool(req: AnalysisRequest):
     industry = req.industry.strip() or "Technology"
     product = (req.product or "your solution").strip() or "your solution"
     baseline = INDUSTRY_BASELINES.get(industry.lower(), INDUSTRY_BASELINES["technology"])
@@ -686,7 +1170,7 @@ def market_analysis_tool(req: AnalysisRequest):
         "competition_overview": f"Competition in {industry} is active, so differentiation should emphasize measurable outcomes over generic features.",
         "opportunity_summary": f"{product} can win by focusing on faster execution, clear ROI, and targeted messaging for operational teams.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "market_tool",
         {"industry": industry, "product": product},
         "Return only JSON with keys: demand_insight, competition_overview, opportunity_summary.",
@@ -706,7 +1190,7 @@ def market_analysis_tool(req: AnalysisRequest):
 
 
 @app.post("/social")
-def generate_social(req: ContentRequest):
+async def generate_social(req: ContentRequest):
     payload = {"product": req.product.strip(), "platform": req.platform.strip()}
     tone_map = {
         "LinkedIn": "professional and insight-driven",
@@ -721,7 +1205,7 @@ def generate_social(req: ContentRequest):
         "tone": tone,
         "ai_insight": f"The message is adapted to {payload['platform']} with a {tone} tone.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "social_generator",
         payload,
         "Return only JSON with keys: caption, hashtags, tone, ai_insight. Hashtags must be a single string.",
@@ -732,7 +1216,7 @@ def generate_social(req: ContentRequest):
 
 
 @app.post("/email")
-def generate_email(req: EmailRequest):
+async def generate_email(req: EmailRequest):
     payload = {
         "recipient": req.recipient.strip(),
         "product": req.product.strip(),
@@ -747,7 +1231,7 @@ def generate_email(req: EmailRequest):
         ),
         "follow_up_suggestion": "Follow up in 3 days with a short proof point or customer outcome.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "email_outreach",
         payload,
         "Return only JSON with keys: subject, body, follow_up_suggestion.",
@@ -763,12 +1247,13 @@ def generate_email(req: EmailRequest):
 
 @app.post("/predict/campaign")
 def predict_campaign(req: PredictionRequest):
-    conn = get_db()
+    conn = get_db(readonly=True)
     cur = conn.cursor()
-    total_leads = cur.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
-    avg_raw = cur.execute("SELECT AVG(score) FROM leads").fetchone()[0]
+    stats = read_pipeline_stats(cur)
+    total_leads = stats["total_leads"]
+    avg_raw = average_score(stats)
     avg_score = round(avg_raw, 1) if avg_raw is not None else 0.0
-    hot_leads = cur.execute("SELECT COUNT(*) FROM leads WHERE score >= 80").fetchone()[0]
+    hot_leads = stats["hot_leads"]
     platform_campaigns = cur.execute("SELECT COUNT(*) FROM campaigns WHERE platform = ?", (req.platform,)).fetchone()[0]
     goal_campaigns = cur.execute("SELECT COUNT(*) FROM campaigns WHERE goal = ?", (req.goal,)).fetchone()[0]
     conn.close()
@@ -830,13 +1315,15 @@ def predict_campaign(req: PredictionRequest):
 
 
 @app.post("/market/analyze")
-def market_intelligence_analysis(req: MarketAnalysisRequest):
+async def market_intelligence_analysis(req: MarketAnalysisRequest):
     industry = req.industry.strip() or "saas"
     region = req.region.strip() or "Global"
     horizon = req.time_horizon.strip() or "Mid"
 
-    db_context = get_market_context()
-    snapshot = get_pipeline_snapshot()
+    # Start the external search first so it overlaps the SQLite reads.
+    search_task = asyncio.ensure_future(try_market_search(industry, region))
+    db_context = await run_in_threadpool(get_market_context)
+    snapshot = await run_in_threadpool(get_pipeline_snapshot)
     baseline = INDUSTRY_BASELINES.get(industry.lower(), INDUSTRY_BASELINES["saas"])
     region_mult = REGION_MULTIPLIERS.get(region, REGION_MULTIPLIERS["Global"])
     time_mult = TIME_MULTIPLIERS.get(horizon, TIME_MULTIPLIERS["Mid"])
@@ -845,7 +1332,7 @@ def market_intelligence_analysis(req: MarketAnalysisRequest):
     competition_score = int(max(0, min(100, round(baseline["competition"] * region_mult["competition"]))))
     opportunity_score = int(max(0, min(100, round(baseline["opportunity"] * time_mult["opportunity"]))))
     saturation = int(round((competition_score + (100 - opportunity_score)) / 2))
-    search_summary = try_market_search(industry, region)
+    search_summary = await search_task
 
     payload = {
         "industry": industry,
@@ -863,7 +1350,7 @@ def market_intelligence_analysis(req: MarketAnalysisRequest):
         "opportunity_insights": f"Opportunity is {opportunity_score}/100. Align messaging with the industries already converting in your pipeline and prioritize the best-fit region.",
         "channels": baseline["channels"],
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "market_intelligence",
         payload,
         "Return only JSON with keys: market_trend_summary, demand_level, competition_overview, opportunity_insights, channels. channels must be an object with channel names and 0-100 values.",
@@ -904,15 +1391,20 @@ def market_intelligence_analysis(req: MarketAnalysisRequest):
     }
 
 
-@app.get("/dashboard")
+@app.api_route("/dashboard", methods=["GET", "HEAD"])
+@snapshot_cache.memoize()
 def dashboard():
-    snapshot = get_pipeline_snapshot()
-    conn = get_db()
+    conn = get_db(readonly=True)
     cur = conn.cursor()
+    result = dashboard_from(cur, pipeline_snapshot_from(cur))
+    conn.close()
+    return result
+
+
+def dashboard_from(cur: sqlite3.Cursor, snapshot: Dict[str, Any]) -> Dict[str, Any]:
     best_platform_row = cur.execute(
         "SELECT platform, COUNT(*) AS cnt FROM campaigns GROUP BY platform ORDER BY cnt DESC, platform ASC LIMIT 1"
     ).fetchone()
-    conn.close()
     metrics = {
         "total_leads": snapshot["total_leads"],
         "hot_leads": snapshot["hot_leads"],
@@ -926,7 +1418,8 @@ def dashboard():
     return {"data_source": "Live Database" if snapshot["total_leads"] else "Empty Database", "metrics": metrics}
 
 
-@app.get("/recommendations")
+@app.api_route("/recommendations", methods=["GET", "HEAD"])
+@snapshot_cache.memoize()
 def recommendations():
     snapshot = get_pipeline_snapshot()
     if snapshot["avg_score"] < 50:
@@ -941,9 +1434,10 @@ def recommendations():
     return {"action": action, "tip": tip, "platform": "LinkedIn"}
 
 
-@app.get("/segments")
+@app.api_route("/segments", methods=["GET", "HEAD"])
+@snapshot_cache.memoize()
 def segments():
-    conn = get_db()
+    conn = get_db(readonly=True)
     cur = conn.cursor()
     result = {
         "high_value": cur.execute("SELECT COUNT(*) FROM leads WHERE score >= 80").fetchone()[0],
@@ -955,7 +1449,7 @@ def segments():
     return result
 
 
-@app.get("/weekly-report")
+@app.api_route("/weekly-report", methods=["GET", "HEAD"])
 def weekly_report():
     snapshot = get_pipeline_snapshot()
     summary = (
@@ -969,10 +1463,26 @@ def weekly_report():
         summary += "Keep nurturing warm leads while building more high-intent demand."
     return {"summary": summary, "generated_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M")}
 
-@app.get("/actions/next")
-def next_actions():
-    conn = get_db()
-    cur = conn.cursor()
+ACTION_COLUMNS = ("lead_id", "company", "category", "action", "reason", "score", "priority_score", "deal_stage")
+
+
+@app.api_route("/actions/next", methods=["GET", "HEAD"])
+def next_actions(format: str = "rows"):
+    fmt = parse_format(format)
+    conn = get_db(readonly=True)
+    actions = next_action_items(conn.cursor())
+    conn.close()
+    if not actions:
+        message = "No leads available. Generate leads to see prioritized actions."
+        if fmt == "columnar":
+            return columnar_response(ACTION_COLUMNS, from_records([], ACTION_COLUMNS), message=message)
+        return {"actions": [], "message": message}
+    if fmt == "columnar":
+        return columnar_response(ACTION_COLUMNS, from_records(actions, ACTION_COLUMNS))
+    return {"actions": actions}
+
+
+def next_action_items(cur: sqlite3.Cursor) -> List[Dict[str, Any]]:
     rows = cur.execute(
         """
         SELECT id, company, score, interest, category, deal_stage, last_contacted
@@ -981,10 +1491,6 @@ def next_actions():
         LIMIT 5
         """
     ).fetchall()
-    conn.close()
-    if not rows:
-        return {"actions": [], "message": "No leads available. Generate leads to see prioritized actions."}
-
     actions = []
     for row in rows:
         if row["score"] >= 85:
@@ -1008,16 +1514,22 @@ def next_actions():
                 "deal_stage": row["deal_stage"],
             }
         )
-    return {"actions": actions}
+    return actions
 
 
-@app.get("/trends/sales")
+@app.api_route("/trends/sales", methods=["GET", "HEAD"])
+@snapshot_cache.memoize()
 def sales_trends():
-    conn = get_db()
-    cur = conn.cursor()
-    total_leads = cur.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+    conn = get_db(readonly=True)
+    result = sales_trends_from(conn.cursor())
+    conn.close()
+    return result
+
+
+def sales_trends_from(cur: sqlite3.Cursor) -> Dict[str, Any]:
+    stats = read_pipeline_stats(cur)
+    total_leads = stats["total_leads"]
     if total_leads < 4:
-        conn.close()
         return {
             "trend": "insufficient",
             "trend_direction": "Insufficient data - add more leads",
@@ -1029,9 +1541,8 @@ def sales_trends():
     window_size = max(2, min(6, total_leads // 2))
     recent_scores = [row[0] for row in cur.execute("SELECT score FROM leads ORDER BY created_at DESC LIMIT ?", (window_size,)).fetchall()]
     older_scores = [row[0] for row in cur.execute("SELECT score FROM leads ORDER BY created_at ASC LIMIT ?", (window_size,)).fetchall()]
-    hot_count = cur.execute("SELECT COUNT(*) FROM leads WHERE score >= 80").fetchone()[0]
-    avg_score = cur.execute("SELECT AVG(score) FROM leads").fetchone()[0] or 0
-    conn.close()
+    hot_count = stats["hot_leads"]
+    avg_score = average_score(stats) or 0
 
     recent_avg = sum(recent_scores) / len(recent_scores)
     older_avg = sum(older_scores) / len(older_scores)
@@ -1077,9 +1588,13 @@ def sales_trends():
     }
 
 
-@app.get("/alerts")
+@app.api_route("/alerts", methods=["GET", "HEAD"])
+@snapshot_cache.memoize()
 def get_alerts():
-    snapshot = get_pipeline_snapshot()
+    return alerts_from(get_pipeline_snapshot())
+
+
+def alerts_from(snapshot: Dict[str, Any]) -> Dict[str, Any]:
     alerts = []
     if snapshot["hot_leads"] == 0:
         alerts.append({"level": "warning", "message": "No hot leads in pipeline", "reason": "Create or qualify more high-intent opportunities."})
@@ -1090,15 +1605,52 @@ def get_alerts():
     return {"alerts": alerts}
 
 
-@app.post("/deal/assist")
-def deal_assist(req: DealAssistRequest):
-    conn = get_db()
+def live_dashboard_payload() -> Dict[str, Any]:
+    """Everything js/dashboard.js renders, in one payload."""
+    return {
+        "dashboard": dashboard(),
+        "recommendations": recommendations(),
+        "segments": segments(),
+        "weekly_report": weekly_report(),
+        "actions": next_actions(),
+        "trends": sales_trends(),
+        "alerts": get_alerts(),
+    }
+
+
+live_dashboard = LiveBroadcaster(
+    data_version,
+    live_dashboard_payload,
+    min_interval=float(os.getenv("LIVE_MIN_INTERVAL", "0.25")),
+    poll_interval=float(os.getenv("LIVE_POLL_INTERVAL", "1")),
+)
+
+
+# Declared before the /{page_name} catch-all, which would otherwise shadow it.
+@app.get("/live")
+async def live():
+    """SSE: a "dashboard" event with live_dashboard_payload() now and after every data change."""
+    return StreamingResponse(
+        live_dashboard.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def fetch_lead(lead_id: int, columns: str) -> Optional[sqlite3.Row]:
+    conn = get_db(readonly=True)
     cur = conn.cursor()
-    row = cur.execute(
-        "SELECT id, company, budget, interest, score, category, industry, region, deal_stage, notes FROM leads WHERE id = ?",
-        (req.lead_id,),
-    ).fetchone()
+    row = cur.execute(f"SELECT {columns} FROM leads WHERE id = ?", (lead_id,)).fetchone()
     conn.close()
+    return row
+
+
+@app.post("/deal/assist")
+@latency_budget(AI_LATENCY_BUDGET)
+async def deal_assist(req: DealAssistRequest):
+    row = await run_in_threadpool(
+        fetch_lead, req.lead_id, "id, company, budget, interest, score, category, industry, region, deal_stage, notes"
+    )
     if not row:
         return {"error": f"Lead ID {req.lead_id} not found"}
 
@@ -1108,7 +1660,7 @@ def deal_assist(req: DealAssistRequest):
         "negotiation_advice": f"Anchor on ROI, tie pricing to the available budget of ${row['budget']:,}, and address implementation risk early.",
         "recommended_next_step": "Book a decision-maker call and send a concise recap with ROI proof points.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "deal_assist",
         {"lead_id": req.lead_id, "score": row["score"], "company": row["company"], "budget": row["budget"], "industry": row["industry"], "deal_stage": row["deal_stage"]},
         "Return only JSON with keys: closing_strategy, negotiation_advice, recommended_next_step.",
@@ -1124,19 +1676,13 @@ def deal_assist(req: DealAssistRequest):
         "urgency_level": urgency_level,
         "explanation": f"{ai_data['recommended_next_step']} Lead profile: {row['category']} lead in {row['deal_stage'] or 'Prospecting'} with score {row['score']}/100.",
     }
-    log_interaction(req.lead_id, "deal_assist", result)
+    await log_interaction(req.lead_id, "deal_assist", result)
     return result
 
 
 @app.post("/followup/plan")
-def followup_plan(req: FollowupRequest):
-    conn = get_db()
-    cur = conn.cursor()
-    row = cur.execute(
-        "SELECT id, company, score, category, deal_stage, industry FROM leads WHERE id = ?",
-        (req.lead_id,),
-    ).fetchone()
-    conn.close()
+async def followup_plan(req: FollowupRequest):
+    row = await run_in_threadpool(fetch_lead, req.lead_id, "id, company, score, category, deal_stage, industry")
     if not row:
         return {"error": f"Lead ID {req.lead_id} not found"}
 
@@ -1148,7 +1694,7 @@ def followup_plan(req: FollowupRequest):
         },
         "note": f"Sequence tailored for a {row['category']} lead in the {row['deal_stage'] or 'Prospecting'} stage.",
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "followup_plan",
         {"lead_id": req.lead_id, "company": row["company"], "score": row["score"], "deal_stage": row["deal_stage"], "category": row["category"]},
         "Return only JSON with keys: plan and note. plan must be an object with keys 'day 1', 'day 3', and 'day 7'.",
@@ -1161,7 +1707,7 @@ def followup_plan(req: FollowupRequest):
         "plan": ai_data["plan"],
         "note": ai_data["note"],
     }
-    log_interaction(req.lead_id, "followup_plan", result)
+    await log_interaction(req.lead_id, "followup_plan", result)
     return result
 
 NAVIGATION_PATTERNS = [
@@ -1258,7 +1804,7 @@ def _safe_audience_from_message(message: str, default_value: str = "startup buye
     return default_value
 
 
-def _tool_execution_from_message(message: str, current_page: str, db_context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+async def _tool_execution_from_message(message: str, current_page: str, db_context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     clean = message.strip()
     low = clean.lower()
 
@@ -1266,7 +1812,7 @@ def _tool_execution_from_message(message: str, current_page: str, db_context: Di
         product = _safe_product_from_message(clean, "SaaS product")
         audience = _safe_audience_from_message(clean, "startup teams")
         req = CampaignRequest(product=product, audience=audience, platform="LinkedIn", goal="Leads")
-        result = generate_campaign(req)
+        result = await generate_campaign(req)
         return {
             "response": (
                 f"Campaign created for {product}. Theme: {result['theme']}. "
@@ -1282,7 +1828,7 @@ def _tool_execution_from_message(message: str, current_page: str, db_context: Di
         product = _safe_product_from_message(clean, "SalesSparkAI")
         target = _safe_audience_from_message(clean, "SaaS founders")
         req = EmailRequest(recipient=target.title(), product=product, context=f"improving pipeline conversion for {target}")
-        result = generate_email(req)
+        result = await generate_email(req)
         return {
             "response": f"Outreach email drafted for {target}. Subject: {result['subject']}",
             "action": "tool_result",
@@ -1295,7 +1841,7 @@ def _tool_execution_from_message(message: str, current_page: str, db_context: Di
         product = _safe_product_from_message(clean, "SalesSparkAI")
         target = _safe_audience_from_message(clean, "SaaS buyers")
         req = PitchRequest(product=product, target=target)
-        result = generate_pitch(req)
+        result = await generate_pitch(req)
         return {
             "response": f"Sales pitch generated for {product} targeting {target}.",
             "action": "tool_result",
@@ -1382,15 +1928,25 @@ def _page_guidance_from_message(message: str, current_page: str) -> Optional[str
     if page == "sales_copilot":
         return "You are on the Sales Copilot page. Track KPI cards, inspect momentum and alerts, and use Next Best Actions to prioritize outreach."
     return None
-@app.post("/chat")
-def chat_assistant(req: ChatRequest):
-    user_message = (req.message or "").strip()
-    if not user_message:
-        return {"error": "Message must not be empty."}
+CHAT_FALLBACK_REPLY = "I'm here to help with SalesSparkAI features like lead analysis, campaign generation, and sales strategy."
+
+CHAT_PAGE_ALIASES = {
+    "home": "home",
+    "landing": "home",
+    "index": "home",
+    "index.html": "home",
+    "copilot": "sales_copilot",
+    "campaigns": "tools",
+    "market": "market",
+    "prediction": "prediction",
+    "leads": "leads",
+    "tools": "tools",
+    "dashboard": "sales_copilot",
+}
 
-    db_context = get_pipeline_snapshot()
-    current_page = req.current_page or "unknown"
 
+async def _chat_rule_reply(user_message: str, current_page: str, db_context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Navigation, tool execution, lead intelligence and page guidance, before any chat LLM call."""
     nav_page = _detect_navigation_intent(user_message)
     if nav_page:
         return {
@@ -1401,7 +1957,7 @@ def chat_assistant(req: ChatRequest):
             "suggestions": _page_suggestions(current_page, db_context),
         }
 
-    tool_result = _tool_execution_from_message(user_message, current_page, db_context)
+    tool_result = await _tool_execution_from_message(user_message, current_page, db_context)
     if tool_result:
         return tool_result
 
@@ -1415,50 +1971,106 @@ def chat_assistant(req: ChatRequest):
             "response": page_guidance,
             "suggestions": _page_suggestions(current_page, db_context),
         }
+    return None
+
+
+def _finish_ai_chat(ai_result: Dict[str, Any], current_page: str, db_context: Dict[str, Any]) -> Dict[str, Any]:
+    if ai_result.get("action") == "navigate":
+        page = (ai_result.get("page") or "").lower()
+        normalized_page = CHAT_PAGE_ALIASES.get(page, page)
+        if normalized_page in NAVIGATION_URLS:
+            ai_result["page"] = normalized_page
+            ai_result["url"] = NAVIGATION_URLS[normalized_page]
+
+    if "suggestions" not in ai_result:
+        ai_result["suggestions"] = _page_suggestions(current_page, db_context)
+
+    return ai_result
+
+
+@app.post("/chat")
+async def chat_assistant(req: ChatRequest):
+    user_message = (req.message or "").strip()
+    if not user_message:
+        return {"error": "Message must not be empty."}
+
+    db_context = await run_in_threadpool(get_pipeline_snapshot)
+    current_page = req.current_page or "unknown"
+
+    rule_reply = await _chat_rule_reply(user_message, current_page, db_context)
+    if rule_reply:
+        return rule_reply
 
     try:
-        ai_result = generate_chat_response(
+        ai_result = await generate_chat_response_async(
             message=user_message,
             db_context=db_context,
             current_page=current_page,
             history=req.history or [],
         )
-
-        if ai_result.get("action") == "navigate":
-            page = (ai_result.get("page") or "").lower()
-            mapping = {
-                "home": "home",
-                "landing": "home",
-                "index": "home",
-                "index.html": "home",
-                "copilot": "sales_copilot",
-                "campaigns": "tools",
-                "market": "market",
-                "prediction": "prediction",
-                "leads": "leads",
-                "tools": "tools",
-                "dashboard": "sales_copilot",
-            }
-            normalized_page = mapping.get(page, page)
-            if normalized_page in NAVIGATION_URLS:
-                ai_result["page"] = normalized_page
-                ai_result["url"] = NAVIGATION_URLS[normalized_page]
-
-        if "suggestions" not in ai_result:
-            ai_result["suggestions"] = _page_suggestions(current_page, db_context)
-
-        return ai_result
+        return _finish_ai_chat(ai_result, current_page, db_context)
 
     except ValueError as exc:
         return {"error": str(exc)}
     except Exception as exc:
         logger.error("[CHAT] Groq error (%s): %s", type(exc).__name__, exc)
         return {
-            "response": "I'm here to help with SalesSparkAI features like lead analysis, campaign generation, and sales strategy.",
+            "response": CHAT_FALLBACK_REPLY,
             "suggestions": _page_suggestions(current_page, db_context),
         }
 
 
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """
+    /chat as Server-Sent Events: "token" events ({"text"}) while the model is
+    writing, then one "done" event carrying the same body /chat would return.
+    Shortcut and rule-based replies arrive as a single "done" event.
+    """
+    user_message = (req.message or "").strip()
+    current_page = req.current_page or "unknown"
+
+    async def events():
+        # Flush headers straight away; tool routing below may take a while.
+        yield ": stream open\n\n"
+        if not user_message:
+            yield sse_event("error", {"error": "Message must not be empty."})
+            return
+
+        db_context = await run_in_threadpool(get_pipeline_snapshot)
+        rule_reply = await _chat_rule_reply(user_message, current_page, db_context)
+        if rule_reply:
+            yield sse_event("done", rule_reply)
+            return
+
+        try:
+            async for event, data in stream_chat_response(
+                message=user_message,
+                db_context=db_context,
+                current_page=current_page,
+                history=req.history or [],
+            ):
+                if event == "done":
+                    data = _finish_ai_chat(data, current_page, db_context)
+                yield sse_event(event, data)
+        except Exception as exc:
+            logger.error("[CHAT] Groq stream error (%s): %s", type(exc).__name__, exc)
+            yield sse_event("done", {
+                "response": CHAT_FALLBACK_REPLY,
+                "suggestions": _page_suggestions(current_page, db_context),
+            })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/chat/test")
 def chat_test():
     api_key = os.getenv("GROQ_API_KEY", "").strip()
@@ -1481,38 +2093,150 @@ def chat_test():
         return {"status": "error", "error_type": type(exc).__name__, "error_detail": str(exc)}
 
 
-@app.get("/health")
-def health():
-    return {"status": "SalesSpark AI Backend Running", "version": "4.0"}
+EXPORT_TABLES = {
+    "leads": LEAD_FIELDS,
+    "campaigns": (
+        "id", "product", "audience", "platform", "goal", "objective", "theme", "marketing_strategy",
+        "messaging_approach", "cta", "expected_outcome", "outcome", "ai_insight", "created_at",
+    ),
+    "interactions": ("id", "lead_id", "action_type", "content", "scheduled_for", "notes", "created_at"),
+}
+
 
+@app.get("/export/{table}")
+def export_table(table: str, format: str = "ndjson", since: Optional[str] = None, gzip: bool = False):
+    """Stream a whole table as NDJSON or CSV (optionally gzipped), rows created at/after ``since``."""
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'. Use one of: {', '.join(EXPORT_TABLES)}.")
+    fmt = format.strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    if since:
+        try:
+            since = datetime.fromisoformat(since.strip()).isoformat()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be an ISO-8601 timestamp")
+
+    columns = [col for col in EXPORT_TABLES[table] if col in SCHEMA.get(table, ())]
+    media_type, ext = EXPORT_FORMATS[fmt]
+    filename = f"{table}.{ext}"
+    if gzip:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    return StreamingResponse(
+        stream_export(lambda: get_db(readonly=True), table, columns, fmt, since=since, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-@app.get("/", include_in_schema=False)
-def root():
-    return FileResponse(os.path.join(PROJECT_ROOT, "index.html"))
 
+# Jobs bypass deal_assist's latency budget: a queued job has no interactive deadline.
+job_manager.register("market_analysis", MarketAnalysisRequest, market_intelligence_analysis)
+job_manager.register("campaign", CampaignRequest, generate_campaign)
+job_manager.register("deal_assist", DealAssistRequest, deal_assist.__wrapped__)
+job_manager.register("followup_plan", FollowupRequest, followup_plan)
 
-@app.get("/{page_name}", include_in_schema=False)
-def serve_page(page_name: str):
-    allowed_pages = {
-        "index.html",
-        "tools.html",
-        "prediction.html",
-        "market_intelligence.html",
-        "sales_copilot.html",
-        "leads.html",
-        "favicon.ico",
+
+@app.post("/jobs/{feature}", status_code=202)
+async def submit_job(feature: str, request: Request):
+    """Queue a long AI generation and return its id straight away."""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    try:
+        job = await job_manager.submit(feature, body)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors())
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Job queue is full, try again shortly", headers={"Retry-After": "5"})
+    job_id = job["job_id"]
+    return dict(job, status_url=f"/jobs/{job_id}", events_url=f"/jobs/{job_id}/events")
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """SSE: a "status" event per state change, then one "done" event with the result."""
+
+    async def events():
+        async for event, job in job_manager.events(job_id):
+            if event == "keepalive":
+                yield ": keepalive\n\n"
+            else:
+                yield sse_event(event, job)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/stats/cache")
+def cache_stats():
+    return {
+        "snapshot": snapshot_cache.stats(),
+        "interaction_writer": interaction_writer.stats(),
+        "market_search": market_search.stats(),
+        "llm_circuit": groq_breaker.stats(),
+        "latency_budgets": deadline_stats(),
+        "jobs": job_manager.stats(),
+        "live": live_dashboard.stats(),
+        "conditional_get": analytics_validators.stats(),
+        "static": static_bundle.stats(),
+        "startup": startup_timings,
+        "ai_outputs": {
+            "memory_entries": len(ai_memory_cache),
+            "memory_max_entries": AI_CACHE_MAX_ENTRIES,
+            "db_max_rows": AI_OUTPUTS_MAX_ROWS,
+            "features": ai_cache_stats.snapshot(),
+            "single_flight": ai_flights.stats(),
+            "revalidation": ai_revalidator.stats(),
+        },
     }
-    if page_name not in allowed_pages:
-        raise HTTPException(status_code=404, detail="File not found")
 
-    if page_name == "favicon.ico":
-        return FileResponse(os.path.join(PROJECT_ROOT, "assets", "favicon.png"))
 
-    return FileResponse(os.path.join(PROJECT_ROOT, page_name))
+@app.post("/pipeline/stats/rebuild")
+def pipeline_stats_rebuild():
+    return check_pipeline_stats(repair=True)
+
+
+@app.api_route("/health", methods=["GET", "HEAD"])
+def health():
+    return {"status": "SalesSpark AI Backend Running", "version": "4.0", "llm_circuit": groq_breaker.state}
+
+
+@app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+def root(request: Request):
+    return static_bundle.response("index.html", request.headers)
+
+
+# Registered last, but it still matches HEAD for any single-segment path whose
+# own route is GET-only: API reads that should answer HEAD must list it.
+@app.api_route("/{page_name}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_page(page_name: str, request: Request):
+    if page_name == "favicon.ico":
+        return static_bundle.response("assets/favicon.png", request.headers)
+    if page_name not in HTML_PAGES:
+        raise HTTPException(status_code=404, detail="File not found")
+    return static_bundle.response(page_name, request.headers)
 
 @app.get("/copilot/insights")
-def copilot_insights():
-    snapshot = get_pipeline_snapshot()
+@snapshot_cache.memoize()
+async def copilot_insights():
+    return await copilot_insights_for(await run_in_threadpool(get_pipeline_snapshot))
+
+
+async def copilot_insights_for(snapshot: Dict[str, Any]) -> Dict[str, Any]:
     distribution = {
         "hot": snapshot["hot_leads"],
         "warm": snapshot["warm_leads"],
@@ -1526,7 +2250,7 @@ def copilot_insights():
             "Use outreach and campaign tools to improve conversion across the middle of the funnel.",
         ],
     }
-    ai_data = ai_or_fallback(
+    ai_data = await ai_or_fallback_async(
         "copilot_insights",
         {"snapshot": snapshot, "distribution": distribution},
         "Return only JSON with keys: summary and insights. insights must be an array of exactly 3 concise strings.",
@@ -1536,6 +2260,70 @@ def copilot_insights():
     return ai_data
 
 
+def _read_copilot_overview(on_snapshot: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """KPIs, trends, alerts and next actions from one read transaction (one consistent view)."""
+    sections: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    conn = get_db(readonly=True)
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        snapshot = pipeline_snapshot_from(cur)
+        on_snapshot(snapshot)
+        builders = {
+            "dashboard": lambda: dashboard_from(cur, snapshot),
+            "trends": lambda: sales_trends_from(cur),
+            "alerts": lambda: alerts_from(snapshot),
+            "actions": lambda: {"actions": next_action_items(cur)},
+        }
+        for name, build in builders.items():
+            try:
+                sections[name] = build()
+            except Exception as exc:
+                logger.warning("[overview] %s failed: %s", name, exc)
+                sections[name] = None
+                errors[name] = f"{type(exc).__name__}: {exc}"
+    finally:
+        conn.rollback()
+        conn.close()
+    return dict(sections, errors=errors)
+
+
+@app.get("/copilot/overview")
+@latency_budget(AI_LATENCY_BUDGET)
+async def copilot_overview():
+    """
+    Everything the copilot page loads, in one round trip: /dashboard,
+    /trends/sales, /alerts and /actions/next from a single read transaction,
+    plus /copilot/insights. The LLM enrichment starts as soon as the snapshot
+    is read and overlaps the remaining queries. A failing section comes back
+    as null and is listed in ``errors``; ``partial`` is then true.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    insights: "asyncio.Future[asyncio.Future[Dict[str, Any]]]" = loop.create_future()
+
+    def start_insights(snapshot: Dict[str, Any]) -> None:
+        insights.set_result(asyncio.ensure_future(copilot_insights_for(snapshot)))
+
+    def on_snapshot(snapshot: Dict[str, Any]) -> None:
+        # Runs in the threadpool; schedule the LLM call on the loop, inside
+        # this request's context so it sees the latency budget.
+        loop.call_soon_threadsafe(start_insights, snapshot, context=context)
+
+    result = await run_in_threadpool(_read_copilot_overview, on_snapshot)
+    errors = result["errors"]
+    try:
+        result["insights"] = await (await insights)
+    except Exception as exc:
+        logger.warning("[overview] insights failed: %s", exc)
+        result["insights"] = None
+        errors["insights"] = f"{type(exc).__name__}: {exc}"
+    result["partial"] = bool(errors)
+    return result
+
+
+
 
 
 
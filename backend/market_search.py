@@ -0,0 +1,208 @@
+"""
+market_search.py
+----------------
+Concurrent external market search for /market/analyze.
+
+Providers (Tavily, SerpAPI, or anything implementing ``SearchProvider``) are
+raced with hedging: the first provider starts immediately, the next one
+starts after ``hedge_delay`` seconds or as soon as an earlier one fails, and
+the first non-empty answer wins (stragglers are cancelled). Requests share a
+pooled ``httpx.AsyncClient``, identical concurrent queries are coalesced, and
+answers are cached per (industry, region, product) with a TTL.
+
+Each provider takes a ``base_url`` so tests can point it at a local stub.
+"""
+
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    from backend.ai_cache import AICacheStats, TTLCache
+    from backend.single_flight import SingleFlight
+except ImportError:
+    from ai_cache import AICacheStats, TTLCache
+    from single_flight import SingleFlight
+
+logger = logging.getLogger("salespark.market_search")
+
+MAX_RESULTS = 3
+
+
+class SearchProvider(ABC):
+    """One search backend: build an HTTP request for a query, parse the JSON reply."""
+
+    name = "provider"
+
+    def __init__(self, api_key: str, base_url: str) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    @abstractmethod
+    async def search(self, client: httpx.AsyncClient, query: str) -> str:
+        """Summary text for ``query`` ("" when there are no results); errors propagate."""
+
+
+class TavilyProvider(SearchProvider):
+    name = "tavily"
+
+    def __init__(self, api_key: str, base_url: str = "https://api.tavily.com") -> None:
+        super().__init__(api_key, base_url)
+
+    async def search(self, client: httpx.AsyncClient, query: str) -> str:
+        resp = await client.post(
+            f"{self.base_url}/search",
+            json={"api_key": self.api_key, "query": query, "search_depth": "basic", "max_results": MAX_RESULTS},
+        )
+        resp.raise_for_status()
+        results = resp.json().get("results", [])[:MAX_RESULTS]
+        return " ".join(f"{item.get('title', '')}: {item.get('content', '')}" for item in results)
+
+
+class SerpApiProvider(SearchProvider):
+    name = "serpapi"
+
+    def __init__(self, api_key: str, base_url: str = "https://serpapi.com") -> None:
+        super().__init__(api_key, base_url)
+
+    async def search(self, client: httpx.AsyncClient, query: str) -> str:
+        resp = await client.get(
+            f"{self.base_url}/search.json",
+            params={"engine": "google", "q": query, "api_key": self.api_key},
+        )
+        resp.raise_for_status()
+        organic = resp.json().get("organic_results", [])[:MAX_RESULTS]
+        return " ".join(f"{item.get('title', '')}: {item.get('snippet', '')}" for item in organic)
+
+
+class MarketSearch:
+    def __init__(
+        self,
+        providers: List[SearchProvider],
+        *,
+        timeout: float = 6.0,
+        hedge_delay: float = 0.75,
+        ttl: float = 1800.0,
+        empty_ttl: float = 60.0,
+        max_entries: int = 256,
+    ) -> None:
+        self.providers = providers
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self._cache = TTLCache(max_entries, AICacheStats())
+        self._flights = SingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats: Counter = Counter()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # The pool belongs to the loop that created it.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def search(self, industry: str, region: str, product: str = "") -> str:
+        if not self.providers:
+            return ""
+        key = (industry.strip().lower(), region.strip().lower(), product.strip().lower())
+        cached = self._cache.get("market_search", key)
+        if cached is not None:
+            self._stats["cache_hits"] += 1
+            return cached
+        self._stats["cache_misses"] += 1
+
+        async def run() -> str:
+            query = f"{industry} market demand competition {region} {product}".strip()
+            summary = await self._race(query)
+            self._cache.set("market_search", key, summary, self.ttl if summary else self.empty_ttl)
+            return summary
+
+        summary, _ = await self._flights.do_async(key, run)
+        return summary
+
+    async def _query(self, provider: SearchProvider, query: str) -> Tuple[str, str]:
+        try:
+            return provider.name, await provider.search(self._get_client(), query)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("[market] %s lookup failed: %s", provider.name, exc)
+            return provider.name, ""
+
+    async def _race(self, query: str) -> str:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        waiting = list(self.providers)
+        running = set()
+
+        def launch() -> None:
+            running.add(asyncio.ensure_future(self._query(waiting.pop(0), query)))
+
+        launch()
+        try:
+            while running:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    break
+                window = min(remaining, self.hedge_delay) if waiting else remaining
+                done, running = await asyncio.wait(running, timeout=window, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if waiting:
+                        self._stats["hedges"] += 1
+                        launch()
+                    continue
+                for task in done:
+                    name, summary = task.result()
+                    if summary:
+                        self._stats[f"wins_{name}"] += 1
+                        return summary
+                    self._stats[f"empty_{name}"] += 1
+                if waiting:
+                    launch()
+            return ""
+        finally:
+            for task in running:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            providers=[provider.name for provider in self.providers],
+            cached_queries=len(self._cache),
+            coalesced=self._flights.stats()["saved"],
+        )
+
+
+def build_market_search() -> MarketSearch:
+    """Providers in priority order from the environment (keys plus optional base URL overrides)."""
+    providers: List[SearchProvider] = []
+    tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
+    serpapi_key = os.getenv("SERPAPI_API_KEY", "").strip()
+    if tavily_key:
+        providers.append(TavilyProvider(tavily_key, os.getenv("TAVILY_BASE_URL", "https://api.tavily.com")))
+    if serpapi_key:
+        providers.append(SerpApiProvider(serpapi_key, os.getenv("SERPAPI_BASE_URL", "https://serpapi.com")))
+    return MarketSearch(
+        providers,
+        timeout=float(os.getenv("MARKET_SEARCH_TIMEOUT", "6")),
+        hedge_delay=float(os.getenv("MARKET_SEARCH_HEDGE_DELAY", "0.75")),
+        ttl=float(os.getenv("MARKET_SEARCH_TTL", "1800")),
+    )
@@ -0,0 +1,260 @@
+"""
+migrations.py
+-------------
+Versioned schema migrations for the SalesSparkAI SQLite database.
+
+Each step runs exactly once, inside its own transaction, and is recorded in
+``schema_version``. Startup on an up-to-date database is a single
+``SELECT MAX(version)`` instead of a ``PRAGMA table_info`` per column.
+Steps take the write lock (``BEGIN IMMEDIATE``) and re-check the version, so
+several workers booting against the same file apply each step once.
+
+``load_schema()`` introspects the migrated database once so the running
+process can keep a cached, known-good view of every table's columns and never
+introspect on a hot path.
+
+To change the schema, append a new ``Migration`` with the next version
+number. Never edit or reorder a step that has already shipped.
+"""
+
+import logging
+import sqlite3
+from typing import Callable, Dict, FrozenSet, List, NamedTuple
+
+try:
+    from backend.pipeline_stats import init_pipeline_stats
+    from backend.snapshot_cache import init_data_version
+except ImportError:
+    from pipeline_stats import init_pipeline_stats
+    from snapshot_cache import init_data_version
+
+logger = logging.getLogger("salespark.migrations")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def ensure_column(cur: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
+    columns = {row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+    if column not in columns:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _baseline_schema(cur: sqlite3.Cursor) -> None:
+    # Databases created before versioning may be missing columns that were
+    # added over time, so the baseline still reconciles them one by one.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS campaigns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product TEXT,
+            audience TEXT,
+            platform TEXT,
+            goal TEXT,
+            objective TEXT,
+            theme TEXT,
+            marketing_strategy TEXT,
+            messaging_approach TEXT,
+            cta TEXT,
+            expected_outcome TEXT,
+            outcome TEXT,
+            ai_insight TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company TEXT,
+            budget INTEGER,
+            interest INTEGER,
+            score INTEGER,
+            category TEXT,
+            industry TEXT,
+            region TEXT,
+            contact_name TEXT,
+            contact_email TEXT,
+            deal_stage TEXT DEFAULT 'Prospecting',
+            last_contacted TIMESTAMP,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS interactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER REFERENCES leads(id),
+            action_type TEXT,
+            content TEXT,
+            scheduled_for TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ai_outputs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature TEXT NOT NULL,
+            input_hash TEXT NOT NULL,
+            output TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(feature, input_hash)
+        )
+        """
+    )
+
+    ensure_column(cur, "campaigns", "audience", "TEXT")
+    ensure_column(cur, "campaigns", "objective", "TEXT")
+    ensure_column(cur, "campaigns", "theme", "TEXT")
+    ensure_column(cur, "campaigns", "marketing_strategy", "TEXT")
+    ensure_column(cur, "campaigns", "messaging_approach", "TEXT")
+    ensure_column(cur, "campaigns", "cta", "TEXT")
+    ensure_column(cur, "campaigns", "expected_outcome", "TEXT")
+    ensure_column(cur, "campaigns", "outcome", "TEXT")
+    ensure_column(cur, "campaigns", "ai_insight", "TEXT")
+
+    ensure_column(cur, "leads", "industry", "TEXT")
+    ensure_column(cur, "leads", "region", "TEXT")
+    ensure_column(cur, "leads", "contact_name", "TEXT")
+    ensure_column(cur, "leads", "contact_email", "TEXT")
+    ensure_column(cur, "leads", "deal_stage", "TEXT DEFAULT 'Prospecting'")
+    ensure_column(cur, "leads", "last_contacted", "TIMESTAMP")
+    ensure_column(cur, "leads", "notes", "TEXT")
+
+    # Backward-compatible interactions schema migration
+    ensure_column(cur, "interactions", "content", "TEXT")
+    ensure_column(cur, "interactions", "scheduled_for", "TEXT")
+    ensure_column(cur, "interactions", "notes", "TEXT")
+
+
+def _pipeline_stats(cur: sqlite3.Cursor) -> None:
+    init_pipeline_stats(cur)
+
+
+def _query_indexes(cur: sqlite3.Cursor) -> None:
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_leads_score_created ON leads(score, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_leads_created ON leads(created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_leads_category ON leads(category)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_platform ON campaigns(platform)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_goal ON campaigns(goal)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_interactions_lead_created ON interactions(lead_id, created_at)")
+
+
+def _lead_filter_indexes(cur: sqlite3.Cursor) -> None:
+    # GET /leads filters on one column and keyset-paginates on
+    # (score, created_at, id); rowid is implicit at the end of every index.
+    for column in ("category", "industry", "region", "deal_stage"):
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_leads_{column}_score ON leads({column}, score, created_at)")
+    cur.execute("DROP INDEX IF EXISTS idx_leads_category")
+
+
+def _ai_outputs_created_index(cur: sqlite3.Cursor) -> None:
+    # Size-capped eviction of the AI output cache deletes oldest-first.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ai_outputs_created ON ai_outputs(created_at)")
+
+
+def _ai_outputs_source(cur: sqlite3.Cursor) -> None:
+    # 'model' or 'fallback'; rows written before this step are model output.
+    ensure_column(cur, "ai_outputs", "source", "TEXT NOT NULL DEFAULT 'model'")
+
+
+def _jobs_table(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            feature TEXT NOT NULL,
+            status TEXT NOT NULL,
+            request TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_finished ON jobs(status, finished_at)")
+
+
+def _data_version(cur: sqlite3.Cursor) -> None:
+    # Shared write counter behind the memoized reads and ETags (see snapshot_cache.py).
+    init_data_version(cur)
+
+
+def _jobs_lease(cur: sqlite3.Cursor) -> None:
+    # Which process runs a job, and until when its claim holds (unix time).
+    ensure_column(cur, "jobs", "owner", "TEXT")
+    ensure_column(cur, "jobs", "lease_until", "REAL")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON jobs(status, lease_until)")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline_schema", _baseline_schema),
+    Migration(2, "pipeline_stats", _pipeline_stats),
+    Migration(3, "query_indexes", _query_indexes),
+    Migration(4, "lead_filter_indexes", _lead_filter_indexes),
+    Migration(5, "ai_outputs_created_index", _ai_outputs_created_index),
+    Migration(6, "ai_outputs_source", _ai_outputs_source),
+    Migration(7, "jobs", _jobs_table),
+    Migration(8, "data_version", _data_version),
+    Migration(9, "jobs_lease", _jobs_lease),
+]
+
+
+def current_version(cur: sqlite3.Cursor) -> int:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    return cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration in order; returns the resulting version."""
+    cur = conn.cursor()
+    version = current_version(cur)
+    conn.commit()
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(cur) >= migration.version:
+                # Another process applied it while we waited for the lock.
+                conn.rollback()
+                version = migration.version
+                continue
+            logger.info("[migrations] Applying %03d_%s", migration.version, migration.name)
+            migration.apply(cur)
+            cur.execute(
+                "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                (migration.version, migration.name),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = migration.version
+    return version
+
+
+def load_schema(cur: sqlite3.Cursor) -> Dict[str, FrozenSet[str]]:
+    tables = [row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()]
+    return {
+        table: frozenset(row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall())
+        for table in tables
+    }
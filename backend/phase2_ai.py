@@ -1,34 +1,91 @@
 import json
 import logging
-import os
 import re
-from typing import Any, Dict
-
-from dotenv import load_dotenv
-
-load_dotenv()
+from typing import Any, Dict, List, NamedTuple, Optional
 
 logger = logging.getLogger("saleskpark.phase2_ai")
 
 try:
-    from groq import Groq
-
-    _groq_available = True
+    from backend.circuit_breaker import groq_breaker
+    from backend.groq_clients import get_async_groq_client, get_groq_client
 except ImportError:
-    _groq_available = False
-    Groq = None
+    from circuit_breaker import groq_breaker
+    from groq_clients import get_async_groq_client, get_groq_client
+
+MODEL = "llama-3.3-70b-versatile"
+
+
+def _messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
 
-_groq_client = None
-_api_key = os.getenv("GROQ_API_KEY", "").strip()
+def _merge_reply(content: str, fallback: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    content = (content or "").strip()
+    if content.startswith("```"):
+        content = re.sub(r"^```(?:json)?\s*", "", content)
+        content = re.sub(r"\s*```$", "", content).strip()
 
-if _api_key and _groq_available:
+    parsed = json.loads(content)
+    if isinstance(parsed, dict):
+        merged = dict(fallback)
+        merged.update({k: v for k, v in parsed.items() if v not in (None, "")})
+        return merged
+    return None
+
+
+class AIResult(NamedTuple):
+    data: Dict[str, Any]
+    from_model: bool  # False: deterministic fallback, must not be cached as AI output
+
+
+def _result_from_completion(feature: str, completion: Any, fallback: Dict[str, Any]) -> AIResult:
     try:
-        _groq_client = Groq(api_key=_api_key)
+        merged = _merge_reply(completion.choices[0].message.content, fallback)
+    except (ValueError, TypeError, AttributeError, IndexError) as exc:
+        logger.warning("[phase2_ai] %s returned unusable output: %s", feature, exc)
+        merged = None
+    if merged is None:
+        return AIResult(fallback, False)
+    return AIResult(merged, True)
+
+
+def generate_json_result(
+    *,
+    feature: str,
+    system_prompt: str,
+    user_prompt: str,
+    fallback: Dict[str, Any],
+    temperature: float = 0.45,
+    max_tokens: int = 700,
+) -> AIResult:
+    """
+    generate_json plus whether the data came from the model. Returns the
+    fallback instantly while the Groq circuit breaker is open.
+    """
+    client = get_groq_client()
+    if not client or not groq_breaker.allow():
+        return AIResult(fallback, False)
+
+    try:
+        completion = client.chat.completions.create(
+            model=MODEL,
+            messages=_messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=False,
+        )
     except Exception as exc:
-        logger.error("[phase2_ai] Failed to initialize Groq client: %s", exc)
+        groq_breaker.record_failure()
+        logger.warning("[phase2_ai] %s generation failed: %s", feature, exc)
+        return AIResult(fallback, False)
+    groq_breaker.record_success()
+    return _result_from_completion(feature, completion, fallback)
 
 
-def generate_json(
+async def generate_json_result_async(
     *,
     feature: str,
     system_prompt: str,
@@ -36,32 +93,62 @@ def generate_json(
     fallback: Dict[str, Any],
     temperature: float = 0.45,
     max_tokens: int = 700,
-) -> Dict[str, Any]:
-    if not _groq_client:
-        return fallback
+) -> AIResult:
+    """Same contract as generate_json_result, on the async client (no worker thread held)."""
+    client = get_async_groq_client()
+    if not client or not groq_breaker.allow():
+        return AIResult(fallback, False)
 
     try:
-        completion = _groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        completion = await client.chat.completions.create(
+            model=MODEL,
+            messages=_messages(system_prompt, user_prompt),
             temperature=temperature,
             max_tokens=max_tokens,
             stream=False,
         )
-        content = (completion.choices[0].message.content or "").strip()
-        if content.startswith("```"):
-            content = re.sub(r"^```(?:json)?\s*", "", content)
-            content = re.sub(r"\s*```$", "", content).strip()
-
-        parsed = json.loads(content)
-        if isinstance(parsed, dict):
-            merged = dict(fallback)
-            merged.update({k: v for k, v in parsed.items() if v not in (None, "")})
-            return merged
     except Exception as exc:
+        groq_breaker.record_failure()
         logger.warning("[phase2_ai] %s generation failed: %s", feature, exc)
+        return AIResult(fallback, False)
+    groq_breaker.record_success()
+    return _result_from_completion(feature, completion, fallback)
+
+
+def generate_json(
+    *,
+    feature: str,
+    system_prompt: str,
+    user_prompt: str,
+    fallback: Dict[str, Any],
+    temperature: float = 0.45,
+    max_tokens: int = 700,
+) -> Dict[str, Any]:
+    return generate_json_result(
+        feature=feature,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        fallback=fallback,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    ).data
 
-    return fallback
+
+async def generate_json_async(
+    *,
+    feature: str,
+    system_prompt: str,
+    user_prompt: str,
+    fallback: Dict[str, Any],
+    temperature: float = 0.45,
+    max_tokens: int = 700,
+) -> Dict[str, Any]:
+    result = await generate_json_result_async(
+        feature=feature,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        fallback=fallback,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    return result.data
@@ -0,0 +1,134 @@
+"""
+pipeline_stats.py
+-----------------
+Trigger-maintained pipeline summary for SalesSparkAI.
+
+``pipeline_stats`` is a single row (id = 1) holding lead counts per score
+band, the score sum/count behind the average, and the campaign total.
+SQLite triggers on ``leads`` and ``campaigns`` keep it current, so the
+pipeline snapshot is an O(1) read regardless of table size.
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+PIPELINE_STATS_TRIGGERS = {
+    "pipeline_stats_lead_insert": """
+        AFTER INSERT ON leads BEGIN
+            UPDATE pipeline_stats SET
+                total_leads = total_leads + 1,
+                hot_leads = hot_leads + (CASE WHEN NEW.score >= 80 THEN 1 ELSE 0 END),
+                warm_leads = warm_leads + (CASE WHEN NEW.score >= 55 AND NEW.score < 80 THEN 1 ELSE 0 END),
+                cold_leads = cold_leads + (CASE WHEN NEW.score < 55 THEN 1 ELSE 0 END),
+                scored_leads = scored_leads + (NEW.score IS NOT NULL),
+                score_sum = score_sum + COALESCE(NEW.score, 0)
+            WHERE id = 1;
+        END
+    """,
+    "pipeline_stats_lead_update": """
+        AFTER UPDATE OF score ON leads BEGIN
+            UPDATE pipeline_stats SET
+                hot_leads = hot_leads
+                    - (CASE WHEN OLD.score >= 80 THEN 1 ELSE 0 END)
+                    + (CASE WHEN NEW.score >= 80 THEN 1 ELSE 0 END),
+                warm_leads = warm_leads
+                    - (CASE WHEN OLD.score >= 55 AND OLD.score < 80 THEN 1 ELSE 0 END)
+                    + (CASE WHEN NEW.score >= 55 AND NEW.score < 80 THEN 1 ELSE 0 END),
+                cold_leads = cold_leads
+                    - (CASE WHEN OLD.score < 55 THEN 1 ELSE 0 END)
+                    + (CASE WHEN NEW.score < 55 THEN 1 ELSE 0 END),
+                scored_leads = scored_leads - (OLD.score IS NOT NULL) + (NEW.score IS NOT NULL),
+                score_sum = score_sum - COALESCE(OLD.score, 0) + COALESCE(NEW.score, 0)
+            WHERE id = 1;
+        END
+    """,
+    "pipeline_stats_lead_delete": """
+        AFTER DELETE ON leads BEGIN
+            UPDATE pipeline_stats SET
+                total_leads = total_leads - 1,
+                hot_leads = hot_leads - (CASE WHEN OLD.score >= 80 THEN 1 ELSE 0 END),
+                warm_leads = warm_leads - (CASE WHEN OLD.score >= 55 AND OLD.score < 80 THEN 1 ELSE 0 END),
+                cold_leads = cold_leads - (CASE WHEN OLD.score < 55 THEN 1 ELSE 0 END),
+                scored_leads = scored_leads - (OLD.score IS NOT NULL),
+                score_sum = score_sum - COALESCE(OLD.score, 0)
+            WHERE id = 1;
+        END
+    """,
+    "pipeline_stats_campaign_insert": """
+        AFTER INSERT ON campaigns BEGIN
+            UPDATE pipeline_stats SET total_campaigns = total_campaigns + 1 WHERE id = 1;
+        END
+    """,
+    "pipeline_stats_campaign_delete": """
+        AFTER DELETE ON campaigns BEGIN
+            UPDATE pipeline_stats SET total_campaigns = total_campaigns - 1 WHERE id = 1;
+        END
+    """,
+}
+
+PIPELINE_STATS_COLUMNS = ("total_leads", "hot_leads", "warm_leads", "cold_leads", "scored_leads", "score_sum", "total_campaigns")
+
+
+def compute_pipeline_stats(cur: sqlite3.Cursor) -> Dict[str, Any]:
+    """Full-scan aggregates over leads/campaigns; the source of truth for pipeline_stats."""
+    row = cur.execute(
+        """
+        SELECT
+            COUNT(*),
+            COALESCE(SUM(CASE WHEN score >= 80 THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN score >= 55 AND score < 80 THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN score < 55 THEN 1 ELSE 0 END), 0),
+            COUNT(score),
+            COALESCE(SUM(score), 0),
+            (SELECT COUNT(*) FROM campaigns)
+        FROM leads
+        """
+    ).fetchone()
+    return dict(zip(PIPELINE_STATS_COLUMNS, tuple(row)))
+
+
+def rebuild_pipeline_stats(cur: sqlite3.Cursor) -> Dict[str, Any]:
+    stats = compute_pipeline_stats(cur)
+    cur.execute(
+        f"""
+        INSERT OR REPLACE INTO pipeline_stats (id, {", ".join(PIPELINE_STATS_COLUMNS)})
+        VALUES (1, {", ".join("?" for _ in PIPELINE_STATS_COLUMNS)})
+        """,
+        tuple(stats[col] for col in PIPELINE_STATS_COLUMNS),
+    )
+    return stats
+
+
+def init_pipeline_stats(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pipeline_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_leads INTEGER NOT NULL DEFAULT 0,
+            hot_leads INTEGER NOT NULL DEFAULT 0,
+            warm_leads INTEGER NOT NULL DEFAULT 0,
+            cold_leads INTEGER NOT NULL DEFAULT 0,
+            scored_leads INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            total_campaigns INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    for name, body in PIPELINE_STATS_TRIGGERS.items():
+        cur.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    if cur.execute("SELECT 1 FROM pipeline_stats WHERE id = 1").fetchone() is None:
+        rebuild_pipeline_stats(cur)
+
+
+def read_pipeline_stats(cur: sqlite3.Cursor) -> Dict[str, Any]:
+    row = cur.execute(f"SELECT {', '.join(PIPELINE_STATS_COLUMNS)} FROM pipeline_stats WHERE id = 1").fetchone()
+    if row is None:
+        return {col: 0 for col in PIPELINE_STATS_COLUMNS}
+    return dict(zip(PIPELINE_STATS_COLUMNS, tuple(row)))
+
+
+def average_score(stats: Dict[str, Any]) -> Optional[float]:
+    """Same result as SELECT AVG(score) FROM leads, from the maintained sums."""
+    if not stats["scored_leads"]:
+        return None
+    return stats["score_sum"] / stats["scored_leads"]
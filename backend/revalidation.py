@@ -0,0 +1,95 @@
+"""
+revalidation.py
+---------------
+Background regeneration of stale AI cache entries (stale-while-revalidate).
+
+Readers serve a stale entry immediately and ``schedule()`` its refresh here.
+Jobs sit in a bounded priority queue (lower number first, so fallback entries
+are refreshed before aged model output) and are run by a few daemon worker
+threads. A key is never queued twice, and a key refreshed less than
+``cooldown`` seconds ago is skipped so a hot stale entry cannot hammer the
+LLM while it keeps failing.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+logger = logging.getLogger("salespark.revalidation")
+
+PRIORITY_FALLBACK = 0
+PRIORITY_STALE = 1
+
+
+class Revalidator:
+    def __init__(
+        self,
+        regenerate: Callable[..., None],
+        *,
+        name: str = "revalidator",
+        workers: int = 2,
+        max_pending: int = 500,
+        cooldown: float = 60.0,
+    ) -> None:
+        self._regenerate = regenerate
+        self.name = name
+        self.workers = workers
+        self.cooldown = cooldown
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Hashable, tuple]]" = queue.PriorityQueue(maxsize=max_pending)
+        self._seq = itertools.count()
+        self._queued: Dict[Hashable, float] = {}
+        self._last_run: Dict[Hashable, float] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats = {"scheduled": 0, "skipped": 0, "dropped": 0, "completed": 0, "failed": 0}
+
+    def _start(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def schedule(self, key: Hashable, priority: int, *args: Any) -> bool:
+        """Queue ``regenerate(*args)`` unless ``key`` is queued or was refreshed recently."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_run.get(key)
+            if key in self._queued or (last is not None and now - last < self.cooldown):
+                self._stats["skipped"] += 1
+                return False
+            try:
+                self._queue.put_nowait((priority, next(self._seq), key, args))
+            except queue.Full:
+                self._stats["dropped"] += 1
+                return False
+            self._queued[key] = now
+            self._stats["scheduled"] += 1
+        if len(self._threads) < self.workers:
+            self._start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            _, _, key, args = self._queue.get()
+            try:
+                self._regenerate(*args)
+                outcome = "completed"
+            except Exception as exc:
+                logger.warning("[%s] Refresh of %s failed: %s", self.name, key, exc)
+                outcome = "failed"
+            with self._lock:
+                self._queued.pop(key, None)
+                self._last_run[key] = time.monotonic()
+                if len(self._last_run) > 10000:
+                    cutoff = time.monotonic() - self.cooldown
+                    self._last_run = {k: t for k, t in self._last_run.items() if t >= cutoff}
+                self._stats[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, pending=self._queue.qsize(), workers=len(self._threads))
@@ -0,0 +1,109 @@
+"""
+scoring.py
+----------
+Lead scoring rules for SalesSparkAI.
+
+``score_lead_formula`` / ``category_for_score`` / ``recommendation_for_category``
+are the scalar rules used by POST /leads. ``score_leads_batch`` applies the
+exact same rules to whole arrays in one vectorized NumPy pass (with a
+pure-Python fallback when NumPy is not installed), for dry-run scoring of
+large lead lists. NumPy is imported on the first batch call, not with the
+module, so POST /leads and app startup never load it.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+CATEGORIES = ("Hot", "Warm", "Cold")
+
+# Lower bounds of each tier (ascending) and the points awarded for reaching it;
+# the first entry of *_POINTS applies below the lowest bound.
+BUDGET_BOUNDS = (5000, 10000, 50000)
+BUDGET_POINTS = (5, 15, 30, 40)
+INTEREST_BOUNDS = (5, 7, 9)
+INTEREST_POINTS = (5, 15, 30, 40)
+
+
+def category_for_score(score: int) -> str:
+    if score >= 80:
+        return "Hot"
+    if score >= 55:
+        return "Warm"
+    return "Cold"
+
+
+def score_lead_formula(budget: int, interest: int) -> int:
+    score = 20
+    if budget >= 50000:
+        score += 40
+    elif budget >= 10000:
+        score += 30
+    elif budget >= 5000:
+        score += 15
+    else:
+        score += 5
+
+    if interest >= 9:
+        score += 40
+    elif interest >= 7:
+        score += 30
+    elif interest >= 5:
+        score += 15
+    else:
+        score += 5
+
+    return min(100, score)
+
+
+def recommendation_for_category(category: str) -> str:
+    if category == "Hot":
+        return "Schedule a discovery call within 3 days"
+    if category == "Warm":
+        return "Send a personalized nurture email with a relevant case study"
+    return "Add to monthly newsletter for long-term brand awareness"
+
+
+def _int64_array(np: Any, values: Sequence[int]) -> Any:
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        # Only the tier a value falls in matters, and every bound is far
+        # inside int64, so clamping out-of-range values keeps the scalar result.
+        info = np.iinfo(np.int64)
+        return np.asarray([min(max(int(v), int(info.min)), int(info.max)) for v in values], dtype=np.int64)
+
+
+def score_leads_batch(budgets: Sequence[int], interests: Sequence[int]) -> Tuple[List[int], List[str], List[str]]:
+    """
+    Vectorized ``score_lead_formula`` + ``category_for_score`` +
+    ``recommendation_for_category`` over equal-length sequences.
+
+    Returns (scores, categories, recommendations) as plain lists.
+    """
+    if len(budgets) != len(interests):
+        raise ValueError("budgets and interests must have the same length")
+
+    try:
+        import numpy as np
+    except ImportError:
+        scores = [score_lead_formula(b, i) for b, i in zip(budgets, interests)]
+        categories = [category_for_score(s) for s in scores]
+        return scores, categories, [recommendation_for_category(c) for c in categories]
+
+    budget_arr = _int64_array(np, budgets)
+    interest_arr = _int64_array(np, interests)
+    # searchsorted(side="right") gives the number of bounds each value meets,
+    # i.e. its tier index, matching the >= comparisons in the scalar rules.
+    budget_pts = np.asarray(BUDGET_POINTS)[np.searchsorted(BUDGET_BOUNDS, budget_arr, side="right")]
+    interest_pts = np.asarray(INTEREST_POINTS)[np.searchsorted(INTEREST_BOUNDS, interest_arr, side="right")]
+    scores = np.minimum(100, 20 + budget_pts + interest_pts)
+
+    category_idx = np.where(scores >= 80, 0, np.where(scores >= 55, 1, 2))
+    categories = np.asarray(CATEGORIES, dtype=object)[category_idx]
+    recommendations = np.asarray([recommendation_for_category(c) for c in CATEGORIES], dtype=object)[category_idx]
+    return scores.tolist(), categories.tolist(), recommendations.tolist()
+
+
+def batch_summary(categories: Sequence[str]) -> Dict[str, Any]:
+    counts = Counter(categories)
+    return {category: counts.get(category, 0) for category in CATEGORIES}
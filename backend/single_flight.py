@@ -0,0 +1,118 @@
+"""
+single_flight.py
+----------------
+Request coalescing for duplicate in-flight work.
+
+``SingleFlight.do(key, fn)`` runs ``fn`` once per key at a time: the first
+caller (the leader) executes it, and callers that arrive with the same key
+while it is running wait for the leader and share its result (or exception)
+instead of repeating the work. ``do_async`` is the event-loop equivalent for
+coroutine functions. Used to keep concurrent identical AI generations down to
+one upstream LLM call.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._leaders: Dict[str, int] = defaultdict(int)
+        self._saved: Dict[str, int] = defaultdict(int)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], group: str = "default") -> Tuple[Any, bool]:
+        """
+        Return ``(result, shared)``. ``shared`` is True when the result came
+        from another caller's execution; callers must not mutate it in place.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._leaders[group] += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self._saved[group] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]], group: str = "default") -> Tuple[Any, bool]:
+        """Coroutine version of ``do``; followers await the leader's future."""
+        with self._lock:
+            future = self._async_calls.get(key)
+            if future is None:
+                future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+                # Nobody may be waiting; mark a failure as retrieved either way.
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._leaders[group] += 1
+                leader = True
+            else:
+                self._saved[group] += 1
+                leader = False
+
+        if not leader:
+            # shield: a follower that goes away must not cancel the shared call.
+            return await asyncio.shield(future), True
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._async_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            groups = sorted(set(self._leaders) | set(self._saved))
+            per_group = {
+                group: {"executed": self._leaders.get(group, 0), "saved": self._saved.get(group, 0)}
+                for group in groups
+            }
+            return {
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "executed": sum(self._leaders.values()),
+                "saved": sum(self._saved.values()),
+                "groups": per_group,
+            }
@@ -0,0 +1,229 @@
+"""
+snapshot_cache.py
+-----------------
+Memoization of pipeline aggregates, invalidated by writes.
+
+The data version is a single row in the database (``data_version``) that
+triggers on ``leads``, ``campaigns`` and ``interactions`` bump on every write,
+so every worker, and any other process writing ``sales.db``, moves the same
+counter. ``DataVersion`` reads it (at most every ``max_age`` seconds) and
+``VersionedCache`` stores each computed value together with the version it
+was computed at and serves it until the version moves on, so the dashboard,
+alerts, segments, trends and copilot endpoints only touch SQLite once per
+write instead of once per poll. Code running on the event loop uses
+``current_async`` / ``value_async`` so the version read never blocks it.
+
+Cached values are shared between requests: treat them as read-only.
+"""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+DATA_VERSION_TABLES = ("leads", "campaigns", "interactions")
+
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+_TOUCH_SQL = f"UPDATE data_version SET version = version + 1, changed_at = {_NOW} WHERE id = 1"
+
+
+def init_data_version(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0,
+            changed_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute(f"INSERT OR IGNORE INTO data_version (id, version, changed_at) VALUES (1, 0, {_NOW})")
+    for table in DATA_VERSION_TABLES:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(
+                f"CREATE TRIGGER IF NOT EXISTS data_version_{table}_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {_TOUCH_SQL}; END"
+            )
+
+
+def touch_data_version(cur: sqlite3.Cursor) -> None:
+    """Bump the shared version for a write the triggers do not see (e.g. a pipeline_stats repair)."""
+    cur.execute(_TOUCH_SQL)
+
+
+def read_data_version(cur: sqlite3.Cursor) -> Tuple[int, float]:
+    row = cur.execute("SELECT version, changed_at FROM data_version WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row is not None else (0, 0.0)
+
+
+class DataVersion:
+    """
+    Monotonic write counter. With a ``reader`` (returning ``(version,
+    changed_at)`` from the ``data_version`` row) the value is shared by every
+    process using the database and re-read when older than ``max_age``
+    seconds; without one it is a process-local counter.
+    """
+
+    def __init__(self, reader: Optional[Callable[[], Tuple[int, float]]] = None, *, max_age: float = 0.0) -> None:
+        self._reader = reader
+        self.max_age = max_age
+        self._value = 0
+        self._changed_at = time.time()
+        self._read_at = float("-inf")
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int], None]] = []
+
+    @property
+    def value(self) -> int:
+        if self._due():
+            return self.refresh()
+        return self._value
+
+    @property
+    def changed_at(self) -> float:
+        return self._changed_at
+
+    def current(self) -> Tuple[int, float]:
+        """``(value, changed_at)`` taken together, refreshed like ``value``."""
+        if self._due():
+            self.refresh()
+        with self._lock:
+            return self._value, self._changed_at
+
+    async def current_async(self) -> Tuple[int, float]:
+        """``current()`` for code on the event loop: a due re-read runs in the threadpool."""
+        if self._due():
+            await run_in_threadpool(self.refresh)
+        with self._lock:
+            return self._value, self._changed_at
+
+    async def value_async(self) -> int:
+        return (await self.current_async())[0]
+
+    def _due(self) -> bool:
+        return self._reader is not None and time.monotonic() - self._read_at >= self.max_age
+
+    def refresh(self) -> int:
+        """Re-read the shared version; listeners are called if it moved."""
+        if self._reader is None:
+            return self._value
+        value, changed_at = self._reader()
+        with self._lock:
+            first_read = self._read_at == float("-inf")
+            self._read_at = time.monotonic()
+            # Concurrent reads can finish out of order: only move forward.
+            moved = value > self._value
+            if moved or first_read:
+                self._value, self._changed_at = value, changed_at
+            value = self._value
+        if moved:
+            self._notify(value)
+        return value
+
+    def bump(self) -> int:
+        """Call after a committed write so this process sees it immediately."""
+        if self._reader is not None:
+            # The triggers already moved the shared row.
+            return self.refresh()
+        with self._lock:
+            self._value += 1
+            self._changed_at = time.time()
+            value = self._value
+        self._notify(value)
+        return value
+
+    def _notify(self, value: int) -> None:
+        for listener in self._listeners:
+            listener(value)
+
+    def add_listener(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(new_value)`` whenever the version moves, on the thread that saw it; keep it cheap."""
+        self._listeners.append(listener)
+
+
+class VersionedCache:
+    """Memoizes computations until the ``DataVersion`` moves on."""
+
+    def __init__(self, version: DataVersion) -> None:
+        self.version = version
+        self._entries: Dict[Hashable, Tuple[int, Any]] = {}
+        self._hits: Dict[Hashable, int] = {}
+        self._misses: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        # Capture the version *before* computing: if a write lands mid-compute
+        # the entry is tagged with the old version and recomputed next time.
+        current = self.version.value
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == current:
+            with self._lock:
+                self._hits[key] = self._hits.get(key, 0) + 1
+            return entry[1]
+
+        value = compute()
+        with self._lock:
+            self._misses[key] = self._misses.get(key, 0) + 1
+            self._entries[key] = (current, value)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        current = await self.version.value_async()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == current:
+            with self._lock:
+                self._hits[key] = self._hits.get(key, 0) + 1
+            return entry[1]
+
+        value = await compute()
+        with self._lock:
+            self._misses[key] = self._misses.get(key, 0) + 1
+            self._entries[key] = (current, value)
+        return value
+
+    def memoize(self, key: Optional[Hashable] = None) -> Callable:
+        """Decorator for zero-argument readers (FastAPI GET handlers, helpers), sync or async."""
+
+        def decorator(func: Callable[[], Any]) -> Callable[[], Any]:
+            cache_key = key or func.__name__
+
+            if asyncio.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper() -> Any:
+                    return await self.get_or_compute_async(cache_key, func)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper() -> Any:
+                return self.get_or_compute(cache_key, func)
+
+            return wrapper
+
+        return decorator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = sorted(set(self._hits) | set(self._misses), key=str)
+            per_key = {
+                str(k): {"hits": self._hits.get(k, 0), "misses": self._misses.get(k, 0)}
+                for k in keys
+            }
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+        return {
+            "data_version": self.version.value,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "entries": per_key,
+        }
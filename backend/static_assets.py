@@ -0,0 +1,190 @@
+"""
+static_assets.py
+----------------
+In-memory, precompressed serving for the HTML pages and /css, /js, /assets.
+
+``StaticBundle.build()`` (run once at startup) reads every file, stores it
+with gzip and, when the optional ``brotli`` package is installed, brotli
+variants, and gives each a content hash. Asset references in the pages
+(``css/style.css``, ``js/app.js``, ...) are rewritten to
+``css/style.css?v=<hash>``, so:
+
+  * fingerprinted asset URLs are sent with ``Cache-Control: immutable`` and a
+    one-year max-age; a new deploy changes the hash and therefore the URL,
+  * pages and un-fingerprinted URLs are sent with ``no-cache`` plus an ETag,
+    so a repeat visit costs a 304 with an empty body.
+
+Requests never touch the filesystem: the variant matching ``Accept-Encoding``
+is served straight from memory. Files added after startup need a restart.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("salespark.static_assets")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# Don't bother compressing tiny files: the headers cost more than the savings.
+MIN_COMPRESS_SIZE = 256
+
+# Pages are rewritten as bytes: not all of them are valid UTF-8.
+_ASSET_REF = re.compile(rb'(\b(?:href|src)=")(?:\./)?((?:css|js|assets)/[^"?#]+)(")')
+
+
+class StaticAsset(NamedTuple):
+    media_type: str
+    digest: str
+    variants: Dict[str, bytes]  # "identity", "gzip", "br"
+
+    @property
+    def etag(self) -> str:
+        # Weak: every encoding of the same content shares one validator.
+        return f'W/"{self.digest}"'
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+def _compress(body: bytes, media_type: str) -> Dict[str, bytes]:
+    variants = {"identity": body}
+    if len(body) < MIN_COMPRESS_SIZE or not media_type.startswith(COMPRESSIBLE):
+        return variants
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gz) < len(body):
+        variants["gzip"] = gz
+    if brotli is not None:
+        br = brotli.compress(body, quality=11)
+        if len(br) < len(body):
+            variants["br"] = br
+    return variants
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class StaticBundle:
+    def __init__(self, root: str, directories: Iterable[str], pages: Iterable[str]) -> None:
+        self.root = root
+        self.directories = tuple(directories)
+        self.pages = tuple(pages)
+        self._assets: Dict[str, StaticAsset] = {}
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+
+    def build(self) -> None:
+        assets: Dict[str, StaticAsset] = {}
+        for directory in self.directories:
+            base = os.path.join(self.root, directory)
+            for dirpath, _, filenames in os.walk(base):
+                for filename in filenames:
+                    full = os.path.join(dirpath, filename)
+                    path = os.path.relpath(full, self.root).replace(os.sep, "/")
+                    assets[path] = self._load(full)
+
+        def fingerprint(match: "re.Match[bytes]") -> bytes:
+            asset = assets.get(match.group(2).decode("ascii", "replace"))
+            if asset is None:
+                return match.group(0)
+            return b"%s%s?v=%s%s" % (match.group(1), match.group(2), asset.digest.encode("ascii"), match.group(3))
+
+        for page in self.pages:
+            full = os.path.join(self.root, page)
+            if not os.path.isfile(full):
+                continue
+            with open(full, "rb") as handle:
+                body = _ASSET_REF.sub(fingerprint, handle.read())
+            assets[page] = StaticAsset("text/html; charset=utf-8", _digest(body), _compress(body, "text/html"))
+
+        with self._lock:
+            self._assets = assets
+        raw = sum(len(asset.variants["identity"]) for asset in assets.values())
+        gz = sum(len(asset.variants.get("gzip", asset.variants["identity"])) for asset in assets.values())
+        logger.info("[static] %d files, %d bytes (%d gzipped)", len(assets), raw, gz)
+
+    def _load(self, full: str) -> StaticAsset:
+        with open(full, "rb") as handle:
+            body = handle.read()
+        media_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        return StaticAsset(media_type, _digest(body), _compress(body, media_type))
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        if not self._assets:
+            self.build()  # first request before the startup hook ran
+        return self._assets.get(path)
+
+    def response(self, path: str, headers: Any, version: Optional[str] = None) -> Response:
+        """Serve ``path`` (e.g. "js/app.js") honouring If-None-Match and Accept-Encoding."""
+        asset = self.get(path)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        cache_control = IMMUTABLE if version == asset.digest else REVALIDATE
+        common = {"ETag": asset.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and any(
+            tag.strip() in ("*", asset.etag, asset.etag[2:]) for tag in if_none_match.split(",")
+        ):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=common)
+
+        encoding, body = self._negotiate(asset, headers.get("accept-encoding", ""))
+        if encoding != "identity":
+            common["Content-Encoding"] = encoding
+        self._stats[f"sent_{encoding}"] += 1
+        self._stats["bytes_sent"] += len(body)
+        return Response(content=body, media_type=asset.media_type, headers=common)
+
+    @staticmethod
+    def _negotiate(asset: StaticAsset, accept_encoding: str) -> Tuple[str, bytes]:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > 0 and encoding in asset.variants:
+                return encoding, asset.variants[encoding]
+        return "identity", asset.variants["identity"]
+
+    def stats(self) -> Dict[str, Any]:
+        assets = list(self._assets.values())
+        return dict(
+            self._stats,
+            files=len(assets),
+            raw_bytes=sum(len(asset.variants["identity"]) for asset in assets),
+            gzip_bytes=sum(len(asset.variants.get("gzip", asset.variants["identity"])) for asset in assets),
+            brotli=brotli is not None,
+        )
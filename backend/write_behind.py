@@ -0,0 +1,151 @@
+"""
+write_behind.py
+---------------
+In-process write-behind buffer with a background flusher thread.
+
+Producers call ``submit()`` and return immediately; a daemon thread groups
+pending items and hands them to ``flush`` once ``max_batch`` items are
+waiting or ``max_delay`` seconds have passed since the first one, whichever
+comes first. The buffer is bounded: when it is full, ``submit()`` blocks for
+up to ``put_timeout`` seconds (backpressure) and then writes the item inline
+rather than dropping it. Code running on an event loop should use
+``offer()``, which never blocks, and hand the item to ``submit()`` on a
+worker thread when it returns False. ``stop()`` drains everything still
+pending.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger("salespark.write_behind")
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class WriteBehindQueue(Generic[T]):
+    def __init__(
+        self,
+        flush: Callable[[List[T]], None],
+        *,
+        name: str = "write-behind",
+        max_batch: int = 500,
+        max_delay: float = 0.25,
+        max_pending: int = 10000,
+        put_timeout: float = 2.0,
+        retries: int = 3,
+    ) -> None:
+        self._flush = flush
+        self.name = name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "flushed": 0, "batches": 0, "inline_writes": 0, "dropped": 0}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def submit(self, item: T) -> None:
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+        self._count("submitted", 1)
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            logger.warning("[%s] Buffer full, writing inline", self.name)
+            self._count("inline_writes", 1)
+            self._write([item])
+
+    def offer(self, item: T) -> bool:
+        """Queue ``item`` without blocking; False (nothing queued) when the buffer is full."""
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        self._count("submitted", 1)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything pending and stop the background thread."""
+        thread = self._thread
+        if not thread or not thread.is_alive():
+            self._drain()
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._drain()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return dict(self._stats, pending=self.pending())
+
+    def _count(self, key: str, amount: int) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _drain(self) -> None:
+        batch: List[T] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[T]) -> None:
+        for attempt in range(1, self.retries + 1):
+            try:
+                self._flush(batch)
+                self._count("flushed", len(batch))
+                self._count("batches", 1)
+                return
+            except Exception as exc:
+                logger.warning("[%s] Flush of %d items failed (attempt %d/%d): %s", self.name, len(batch), attempt, self.retries, exc)
+                time.sleep(0.05 * attempt)
+        self._count("dropped", len(batch))
+        logger.error("[%s] Dropped %d items after %d failed flushes", self.name, len(batch), self.retries)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[T] = [first]
+            deadline = time.monotonic() + self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stopping:
+                return
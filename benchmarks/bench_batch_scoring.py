@@ -0,0 +1,59 @@
+"""
+bench_batch_scoring.py
+----------------------
+Benchmark for the vectorized lead scorer: times a Python loop over
+``score_lead_formula`` / ``category_for_score`` / ``recommendation_for_category``
+against one ``score_leads_batch`` pass.
+
+That the two agree exactly (every tier boundary, values outside int64, a
+random sample) is checked by ``tests/test_scoring.py``.
+
+Usage (from the project root):
+    python -m benchmarks.bench_batch_scoring --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from backend.scoring import (
+    category_for_score,
+    recommendation_for_category,
+    score_lead_formula,
+    score_leads_batch,
+)
+
+
+def scalar_batch(budgets, interests):
+    scores = [score_lead_formula(b, i) for b, i in zip(budgets, interests)]
+    categories = [category_for_score(s) for s in scores]
+    return scores, categories, [recommendation_for_category(c) for c in categories]
+
+
+def bench(sizes) -> None:
+    rng = random.Random(7)
+    for size in sizes:
+        budgets = [rng.randint(0, 120000) for _ in range(size)]
+        interests = [rng.randint(1, 10) for _ in range(size)]
+
+        start = time.perf_counter()
+        scalar_batch(budgets, interests)
+        loop_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        score_leads_batch(budgets, interests)
+        vec_s = time.perf_counter() - start
+
+        print(f"rows={size:>9,}  python-loop={loop_s * 1000:9.1f}ms  vectorized={vec_s * 1000:9.1f}ms  speedup={loop_s / vec_s:5.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    bench(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_columnar.py
+-----------------
+Micro-benchmark: row-object JSON (one dict per sqlite3.Row, what GET /leads
+returns by default) vs. the columnar format from backend/columnar.py
+(``?format=columnar``), at several table sizes.
+
+Each variant runs the full path a list endpoint takes: fetch from SQLite,
+build the body, encode it. Reported: best-of-N latency and encoded bytes.
+
+Usage (from the project root):
+    python -m benchmarks.bench_columnar --sizes 10000,100000,1000000 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from backend import columnar
+
+COLUMNS = (
+    "id", "company", "budget", "interest", "score", "category", "industry", "region",
+    "contact_name", "contact_email", "deal_stage", "last_contacted", "notes", "created_at",
+)
+QUERY = f"SELECT {', '.join(COLUMNS)} FROM leads ORDER BY id LIMIT ?"
+
+
+def build_db(path: str, n_leads: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, company TEXT, budget INTEGER, interest INTEGER,
+            score INTEGER, category TEXT, industry TEXT, region TEXT, contact_name TEXT,
+            contact_email TEXT, deal_stage TEXT, last_contacted TEXT, notes TEXT, created_at TIMESTAMP
+        )
+        """
+    )
+    rng = random.Random(7)
+    conn.executemany(
+        f"INSERT INTO leads ({', '.join(COLUMNS[1:])}) VALUES ({', '.join('?' * (len(COLUMNS) - 1))})",
+        (
+            (
+                f"Company {i}", rng.randint(1000, 90000), rng.randint(1, 10), rng.randint(10, 100),
+                rng.choice(["Hot", "Warm", "Cold"]), rng.choice(["SaaS", "Finance", "Energy"]),
+                rng.choice(["APAC", "Europe", "North America"]), f"Contact {i}", f"contact{i}@example.com",
+                rng.choice(["Prospecting", "Proposal", "Negotiation"]), "2024-05-01", None, "2024-05-01 10:00:00",
+            )
+            for i in range(n_leads)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def rows_json(conn: sqlite3.Connection, n: int) -> bytes:
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(QUERY, (n,)).fetchall()
+    body = {"leads": [{col: row[col] for col in COLUMNS} for row in rows]}
+    return json.dumps(body).encode("utf-8")
+
+
+def columnar_stdlib(conn: sqlite3.Connection, n: int) -> bytes:
+    rows = columnar.tuple_cursor(conn).execute(QUERY, (n,)).fetchall()
+    data = columnar.transpose(rows, len(COLUMNS))
+    return json.dumps({"columns": COLUMNS, "data": data}, separators=(",", ":")).encode("utf-8")
+
+
+def columnar_fast(conn: sqlite3.Connection, n: int) -> bytes:
+    rows = columnar.tuple_cursor(conn).execute(QUERY, (n,)).fetchall()
+    return columnar.dumps({"columns": COLUMNS, "data": columnar.transpose(rows, len(COLUMNS))})
+
+
+def measure(fn: Callable[[sqlite3.Connection, int], bytes], path: str, n: int, repeat: int) -> Tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        conn = sqlite3.connect(path)
+        started = time.perf_counter()
+        size = len(fn(conn, n))
+        best = min(best, time.perf_counter() - started)
+        conn.close()
+    return best * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sizes: List[int] = [int(size) for size in args.sizes.split(",")]
+
+    variants = [
+        ("rows (dict per row, json)", rows_json),
+        ("columnar (tuples, json)", columnar_stdlib),
+        (f"columnar (tuples, {'orjson' if columnar.orjson else 'json'})", columnar_fast),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "leads.db")
+        build_db(path, max(sizes))
+        for n in sizes:
+            baseline_ms = None
+            for label, fn in variants:
+                ms, size = measure(fn, path, n, args.repeat)
+                baseline_ms = baseline_ms or ms
+                print(f"rows={n:<8} {label:<30} {ms:9.1f}ms {size / 1e6:8.2f}MB  x{baseline_ms / ms:4.1f}")
+
+
+if __name__ == "__main__":
+    main()
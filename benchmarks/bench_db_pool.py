@@ -0,0 +1,136 @@
+"""
+bench_db_pool.py
+----------------
+Micro-benchmark: connect-per-call get_db() vs. the pooled, tuned connections
+in backend/db_pool.py.
+
+Runs the same query mix a /market/analyze request goes through (market
+context, pipeline snapshot, ai_outputs lookup + upsert) against a throwaway
+database, sequentially and from a thread pool.
+
+Usage (from the project root):
+    python -m benchmarks.bench_db_pool --leads 20000 --requests 2000 --threads 8
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.db_pool import ConnectionPool
+
+SCHEMA = """
+CREATE TABLE leads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, company TEXT, budget INTEGER, interest INTEGER,
+    score INTEGER, category TEXT, industry TEXT, region TEXT, created_at TIMESTAMP
+);
+CREATE TABLE campaigns (id INTEGER PRIMARY KEY AUTOINCREMENT, product TEXT, platform TEXT);
+CREATE TABLE ai_outputs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, feature TEXT NOT NULL, input_hash TEXT NOT NULL,
+    output TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(feature, input_hash)
+);
+"""
+
+
+def build_db(path: str, n_leads: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    rng = random.Random(7)
+    conn.executemany(
+        "INSERT INTO leads (company, budget, interest, score, category, industry, region, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))",
+        [
+            (f"Co{i}", rng.randint(1000, 90000), rng.randint(1, 10), rng.randint(10, 100), "Warm",
+             rng.choice(["SaaS", "Finance", "Energy"]), rng.choice(["APAC", "Europe"]))
+            for i in range(n_leads)
+        ],
+    )
+    conn.executemany("INSERT INTO campaigns (product, platform) VALUES (?, ?)", [(f"P{i}", "LinkedIn") for i in range(50)])
+    conn.commit()
+    conn.close()
+
+
+def request_mix(get_conn, get_read_conn, idx: int) -> None:
+    conn = get_read_conn()
+    conn.execute("SELECT DISTINCT industry FROM leads").fetchall()
+    conn.execute("SELECT DISTINCT region FROM leads").fetchall()
+    conn.close()
+
+    conn = get_read_conn()
+    conn.execute("SELECT COUNT(*) FROM leads WHERE score >= 80").fetchone()
+    conn.execute("SELECT AVG(score) FROM leads").fetchone()
+    conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()
+    conn.close()
+
+    conn = get_read_conn()
+    conn.execute("SELECT output FROM ai_outputs WHERE feature = ? AND input_hash = ?", ("bench", str(idx % 50))).fetchone()
+    conn.close()
+
+    conn = get_conn()
+    conn.execute(
+        "INSERT INTO ai_outputs (feature, input_hash, output) VALUES (?, ?, ?) "
+        "ON CONFLICT(feature, input_hash) DO UPDATE SET output = excluded.output",
+        ("bench", str(idx % 50), "{}"),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(label: str, get_conn, get_read_conn, requests: int, threads: int) -> None:
+    def timed(idx: int) -> float:
+        start = time.perf_counter()
+        request_mix(get_conn, get_read_conn, idx)
+        return (time.perf_counter() - start) * 1000
+
+    started = time.perf_counter()
+    if threads <= 1:
+        latencies = [timed(i) for i in range(requests)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<28} threads={threads:<3} req/s={requests / elapsed:9.1f} "
+        f"p50={statistics.median(latencies):7.3f}ms p99={p99:7.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Separate files: WAL mode is persistent, so the baseline must never
+        # see a database the pool has already converted.
+        baseline_path = os.path.join(tmp, "baseline.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+        build_db(baseline_path, args.leads)
+        build_db(pooled_path, args.leads)
+
+        def connect_per_call() -> sqlite3.Connection:
+            conn = sqlite3.connect(baseline_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        write_pool = ConnectionPool(pooled_path, size=args.threads)
+        read_pool = ConnectionPool(pooled_path, size=args.threads * 2, readonly=True)
+
+        for threads in (1, args.threads):
+            run("connect-per-call", connect_per_call, connect_per_call, args.requests, threads)
+            run("pooled (WAL, tuned)", write_pool.acquire, read_pool.acquire, args.requests, threads)
+
+        write_pool.close_all()
+        read_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
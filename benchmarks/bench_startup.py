@@ -0,0 +1,138 @@
+"""
+bench_startup.py
+----------------
+Startup-time profile: how long ``import backend.main`` takes, where that time
+goes (``python -X importtime``), and how long the lifespan startup steps
+(migrations/seed check, static bundle, job workers) take.
+
+Every measurement runs in a fresh interpreter so nothing is already cached in
+``sys.modules``. The import is also checked for side effects that belong in
+the lifespan hook: opening a database connection or importing ``groq`` or
+``numpy`` (only batch scoring needs it).
+
+Note that the lifespan step runs against the real ``backend/sales.db``, the
+same as a server boot would.
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup --top 15 --repeat 5
+    python -m benchmarks.bench_startup --max-import-ms 900   # exit 1 when slower
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main as main
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({
+    "import_ms": elapsed,
+    "db_connections": main._write_pool._created + main._read_pool._created,
+    "groq_imported": "groq" in sys.modules,
+    "numpy_imported": "numpy" in sys.modules,
+}))
+"""
+
+LIFESPAN_PROBE = """
+import asyncio, json, logging
+logging.disable(logging.CRITICAL)
+import backend.main as main
+
+async def boot():
+    async with main.lifespan(main.app):
+        pass
+
+asyncio.run(boot())
+print(json.dumps(main.startup_timings))
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    """Rows of ``-X importtime`` output ("import time: self | cumulative | name")."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One separator space, then two per nesting level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def by_package(rows: List[ImportTime]) -> Dict[str, int]:
+    """Self time summed per top-level package; the app's own modules are listed individually."""
+    totals: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        package = row.module if row.module.startswith("backend.") else row.module.split(".")[0]
+        totals[package] += row.self_us
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if the best import time exceeds this")
+    parser.add_argument("--skip-lifespan", action="store_true")
+    args = parser.parse_args()
+
+    probes = [json.loads(_run(["-c", IMPORT_PROBE]).stdout.strip().splitlines()[-1]) for _ in range(args.repeat)]
+    best = min(probe["import_ms"] for probe in probes)
+    print(f"import backend.main: best {best:.1f}ms, median {sorted(p['import_ms'] for p in probes)[len(probes) // 2]:.1f}ms")
+    side_effects = probes[0]
+    print(f"  db connections opened on import: {side_effects['db_connections']}")
+    print(f"  groq imported on import:         {side_effects['groq_imported']}")
+    print(f"  numpy imported on import:        {side_effects['numpy_imported']}")
+
+    rows = parse_importtime(_run(["-X", "importtime", "-c", "import backend.main"]).stderr)
+    print(f"\ntop {args.top} packages by self time ({len(rows)} modules imported)")
+    for package, self_us in sorted(by_package(rows).items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {self_us / 1000:8.1f}ms  {package}")
+
+    print(f"\ntop {args.top} direct imports of backend.main by cumulative time")
+    direct = [row for row in rows if row.depth == 1]
+    for row in sorted(direct, key=lambda row: -row.cumulative_us)[: args.top]:
+        print(f"  {row.cumulative_us / 1000:8.1f}ms  {row.module}")
+
+    if not args.skip_lifespan:
+        timings = json.loads(_run(["-c", LIFESPAN_PROBE]).stdout.strip().splitlines()[-1])
+        print("\nlifespan startup")
+        for step, ms in timings.items():
+            print(f"  {ms:8.1f}ms  {step}")
+
+    failures = []
+    if side_effects["db_connections"] or side_effects["groq_imported"] or side_effects["numpy_imported"]:
+        failures.append("importing backend.main has startup side effects")
+    if args.max_import_ms is not None and best > args.max_import_ms:
+        failures.append(f"import took {best:.1f}ms > {args.max_import_ms:.1f}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
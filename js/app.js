@@ -366,9 +366,11 @@ async function processBotResponse(msg) {
     }
 
     const typingId = showTyping();
+    let streamBubble = null;
+    let streamed = '';
 
     try {
-        const res = await fetch('http://127.0.0.1:8000/chat', {
+        const res = await fetch('http://127.0.0.1:8000/chat/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
@@ -378,49 +380,107 @@ async function processBotResponse(msg) {
                 history: chatHistory.slice(-6),
             })
         });
+        if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+        let finished = false;
+        await readEventStream(res, (event, data) => {
+            if (event === 'token') {
+                if (!streamBubble) {
+                    removeTyping(typingId);
+                    streamBubble = addMessage('', 'bot');
+                }
+                streamed += data.text || '';
+                streamBubble.innerHTML = streamed;
+                scrollChatToBottom();
+                return;
+            }
+            finished = true;
+            removeTyping(typingId);
+            if (streamBubble && data.action !== 'navigate' && data.action !== 'tool_result' && data.action !== 'multi_step' && !data.error) {
+                // Tokens are already on screen; settle on the final text.
+                const reply = data.response || streamed;
+                streamBubble.innerHTML = reply;
+                addToHistory('user', msg);
+                addToHistory('assistant', reply);
+                if (Array.isArray(data.suggestions) && data.suggestions.length) {
+                    updateSuggestions(data.suggestions);
+                }
+                return;
+            }
+            if (streamBubble) streamBubble.closest('.chat-message').remove();
+            renderChatReply(msg, data);
+        });
+
+        if (!finished) {
+            removeTyping(typingId);
+            if (!streamBubble) addMessage('No response received.', 'bot');
+        }
 
-        const data = await res.json();
+    } catch (e) {
+        console.error('[Chat] Network error:', e);
         removeTyping(typingId);
+        addMessage('Could not connect to SalesSpark Brain. Is the server running?', 'bot');
+    }
+}
 
-        if (data.error) {
-            addMessage(`Error: ${data.error}`, 'bot');
-            return;
+// Minimal SSE reader for POST responses (EventSource only supports GET).
+async function readEventStream(res, onEvent) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            let event = 'message';
+            const dataLines = [];
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+            });
+            if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
         }
+    }
+}
 
-        if (data.action === 'navigate') {
-            addToHistory('user', msg);
-            addToHistory('assistant', data.response || '');
-            handleNavigationAction(data);
-            if (Array.isArray(data.suggestions) && data.suggestions.length) {
-                updateSuggestions(data.suggestions);
-            }
-            return;
-        }
+function renderChatReply(msg, data) {
+    if (data.error) {
+        addMessage(`Error: ${data.error}`, 'bot');
+        return;
+    }
 
-        if (data.action === 'tool_result' || data.action === 'multi_step') {
-            const reply = formatToolResult(data);
-            addMessage(reply, 'bot');
-            addToHistory('user', msg);
-            addToHistory('assistant', data.response || reply);
-            if (Array.isArray(data.suggestions) && data.suggestions.length) {
-                updateSuggestions(data.suggestions);
-            }
-            return;
+    if (data.action === 'navigate') {
+        addToHistory('user', msg);
+        addToHistory('assistant', data.response || '');
+        handleNavigationAction(data);
+        if (Array.isArray(data.suggestions) && data.suggestions.length) {
+            updateSuggestions(data.suggestions);
         }
+        return;
+    }
 
-        const reply = data.response || 'No response received.';
+    if (data.action === 'tool_result' || data.action === 'multi_step') {
+        const reply = formatToolResult(data);
         addMessage(reply, 'bot');
         addToHistory('user', msg);
-        addToHistory('assistant', reply);
-
+        addToHistory('assistant', data.response || reply);
         if (Array.isArray(data.suggestions) && data.suggestions.length) {
             updateSuggestions(data.suggestions);
         }
+        return;
+    }
 
-    } catch (e) {
-        console.error('[Chat] Network error:', e);
-        removeTyping(typingId);
-        addMessage('Could not connect to SalesSpark Brain. Is the server running?', 'bot');
+    const reply = data.response || 'No response received.';
+    addMessage(reply, 'bot');
+    addToHistory('user', msg);
+    addToHistory('assistant', reply);
+
+    if (Array.isArray(data.suggestions) && data.suggestions.length) {
+        updateSuggestions(data.suggestions);
     }
 }
 
@@ -464,6 +524,12 @@ function addMessage(text, sender) {
         ? `<div class="message-content"><div class="bot-avatar">🤖</div><div class="bubble">${text}</div></div>`
         : `<div class="message-content"><div class="bubble">${text}</div></div>`;
     body.appendChild(div);
+    scrollChatToBottom();
+    return div.querySelector('.bubble');
+}
+
+function scrollChatToBottom() {
+    const body = document.getElementById('chatBody');
     body.scrollTo({ top: body.scrollHeight, behavior: 'smooth' });
 }
 
@@ -1,19 +1,32 @@
 const API = 'http://127.0.0.1:8000';
 
-document.addEventListener('DOMContentLoaded', async () => {
+document.addEventListener('DOMContentLoaded', loadOverview);
+
+// One round trip for the whole page. Sections missing from a partial
+// response (null) are fetched from their own endpoints.
+async function loadOverview() {
+    let data = {};
+    try {
+        const res = await fetch(`${API}/copilot/overview`);
+        if (res.ok) data = await res.json();
+    } catch (e) {
+        console.warn('[Copilot] Overview failed, loading sections separately:', e);
+    }
     await Promise.allSettled([
-        loadKPIs(),
-        loadNextActions(),
-        loadSalesTrends(),
-        loadAlerts(),
-        loadInsights(),
+        loadKPIs(data.dashboard),
+        loadNextActions(data.actions),
+        loadSalesTrends(data.trends),
+        loadAlerts(data.alerts),
+        loadInsights(data.insights),
     ]);
-});
+}
 
-async function loadKPIs() {
+async function loadKPIs(data) {
     try {
-        const res = await fetch(`${API}/dashboard`);
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch(`${API}/dashboard`);
+            data = await res.json();
+        }
         const m = data.metrics || {};
 
         setText('kpi-total', m.total_leads ?? '-');
@@ -41,13 +54,15 @@ async function loadKPIs() {
     }
 }
 
-async function loadInsights() {
+async function loadInsights(data) {
     const container = document.getElementById('insights-panel');
     if (!container) return;
 
     try {
-        const res = await fetch(`${API}/copilot/insights`);
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch(`${API}/copilot/insights`);
+            data = await res.json();
+        }
         const items = [data.summary, ...(data.insights || [])].filter(Boolean);
         container.innerHTML = items.map(text => `
             <div class="insight-item">
@@ -60,11 +75,13 @@ async function loadInsights() {
     }
 }
 
-async function loadNextActions() {
+async function loadNextActions(data) {
     const container = document.getElementById('next-actions-container');
     try {
-        const res = await fetch(`${API}/actions/next`);
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch(`${API}/actions/next`);
+            data = await res.json();
+        }
 
         if (!data.actions || data.actions.length === 0) {
             container.innerHTML = `<div style="padding:28px;text-align:center;color:var(--text-muted);font-size:14px;">${data.message || 'No actions available.'}</div>`;
@@ -92,10 +109,12 @@ async function loadNextActions() {
     }
 }
 
-async function loadSalesTrends() {
+async function loadSalesTrends(data) {
     try {
-        const res = await fetch(`${API}/trends/sales`);
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch(`${API}/trends/sales`);
+            data = await res.json();
+        }
         const TREND_COLOR = { improving: '#22c55e', declining: '#f87171', stable: '#f59e0b', insufficient: '#94a3b8' };
         const color = TREND_COLOR[data.trend] || '#94a3b8';
 
@@ -124,10 +143,12 @@ async function loadSalesTrends() {
     }
 }
 
-async function loadAlerts() {
+async function loadAlerts(data) {
     try {
-        const res = await fetch(`${API}/alerts`);
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch(`${API}/alerts`);
+            data = await res.json();
+        }
         const wrapper = document.getElementById('alerts-container');
         const inner = document.getElementById('alerts-inner');
 
@@ -154,7 +175,7 @@ async function refreshDashboard() {
         btn.style.opacity = '0.5';
         btn.style.pointerEvents = 'none';
     }
-    await Promise.allSettled([loadKPIs(), loadNextActions(), loadSalesTrends(), loadAlerts(), loadInsights()]);
+    await loadOverview();
     if (btn) {
         btn.style.opacity = '';
         btn.style.pointerEvents = '';
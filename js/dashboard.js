@@ -1,16 +1,22 @@
 /**
  * Dashboard Logic
- * Fetches real-time metrics from FastAPI Backend
+ * Receives real-time metrics from the FastAPI backend over /live (SSE),
+ * polling the individual endpoints when the stream is unavailable.
  */
 
 const API_URL = "http://127.0.0.1:8000/dashboard";
+const LIVE_URL = "http://127.0.0.1:8000/live";
+const POLL_INTERVAL_MS = 5000;
 
-async function renderDashboard() {
+// `live` is a /live payload; without it every section is fetched separately.
+async function renderDashboard(live) {
     try {
-        const res = await fetch(API_URL);
-        if (!res.ok) throw new Error("Backend not reachable");
-
-        const data = await res.json();
+        let data = live && live.dashboard;
+        if (!data) {
+            const res = await fetch(API_URL);
+            if (!res.ok) throw new Error("Backend not reachable");
+            data = await res.json();
+        }
 
         // NEW RESPONSE FORMAT: data.data_source and data.metrics
         const metrics = data.metrics || data; // Fallback for backwards compat
@@ -80,14 +86,14 @@ async function renderDashboard() {
         }
 
         // PHASE 2: Load Intelligence Features
-        await loadRecommendations();
-        await loadSegments();
-        await loadWeeklyReport();
+        await loadRecommendations(live && live.recommendations);
+        await loadSegments(live && live.segments);
+        await loadWeeklyReport(live && live.weekly_report);
 
         // PHASE 3: Load Sales Action Copilot
-        await loadNextActions();
-        await loadSalesTrends();
-        await loadAlerts();
+        await loadNextActions(live && live.actions);
+        await loadSalesTrends(live && live.trends);
+        await loadAlerts(live && live.alerts);
 
     } catch (e) {
         console.error("Dashboard Sync Failed:", e);
@@ -130,10 +136,12 @@ function renderChart(avgScore) {
 
 // ==================== PHASE 2: INTELLIGENCE LAYER ====================
 
-async function loadRecommendations() {
+async function loadRecommendations(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/recommendations');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/recommendations');
+            data = await res.json();
+        }
 
         document.getElementById('rec_action').innerText = data.priority_action;
         document.getElementById('rec_tip').innerText = data.strategy_tip;
@@ -143,10 +151,12 @@ async function loadRecommendations() {
     }
 }
 
-async function loadSegments() {
+async function loadSegments(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/segments');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/segments');
+            data = await res.json();
+        }
 
         document.getElementById('seg_high').innerText = data.high_value;
         document.getElementById('seg_intent').innerText = data.high_intent;
@@ -157,10 +167,12 @@ async function loadSegments() {
     }
 }
 
-async function loadWeeklyReport() {
+async function loadWeeklyReport(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/weekly-report');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/weekly-report');
+            data = await res.json();
+        }
 
         document.getElementById('report_summary').innerText = data.summary;
         const trendIcon = data.trend === 'up' ? '📈' : data.trend === 'down' ? '📉' : '➡️';
@@ -170,17 +182,43 @@ async function loadWeeklyReport() {
     }
 }
 
-// Initial Render
-document.addEventListener('DOMContentLoaded', renderDashboard);
+// Live updates: the server pushes a fresh payload after every data change.
+// Fall back to polling while the stream is down (EventSource reconnects itself).
+let pollTimer = null;
+
+function startPolling() {
+    if (pollTimer) return;
+    renderDashboard();
+    pollTimer = setInterval(renderDashboard, POLL_INTERVAL_MS);
+}
 
-// Auto-refresh every 5 seconds for "Real-time" feel
-setInterval(renderDashboard, 5000);
+function stopPolling() {
+    clearInterval(pollTimer);
+    pollTimer = null;
+}
+
+function startLiveDashboard() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    const source = new EventSource(LIVE_URL);
+    source.addEventListener('dashboard', (event) => {
+        stopPolling();
+        renderDashboard(JSON.parse(event.data));
+    });
+    source.addEventListener('error', startPolling);
+}
+
+document.addEventListener('DOMContentLoaded', startLiveDashboard);
 // ==================== PHASE 3: SALES ACTION COPILOT ====================
 
-async function loadNextActions() {
+async function loadNextActions(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/actions/next');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/actions/next');
+            data = await res.json();
+        }
 
         const container = document.getElementById('next-actions-container');
 
@@ -220,10 +258,12 @@ async function loadNextActions() {
     }
 }
 
-async function loadSalesTrends() {
+async function loadSalesTrends(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/trends/sales');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/trends/sales');
+            data = await res.json();
+        }
 
         const trendBadge = document.getElementById('trend-badge');
         const trendDirection = document.getElementById('trend-direction');
@@ -291,10 +331,12 @@ async function loadSalesTrends() {
     }
 }
 
-async function loadAlerts() {
+async function loadAlerts(data) {
     try {
-        const res = await fetch('http://127.0.0.1:8000/alerts');
-        const data = await res.json();
+        if (!data) {
+            const res = await fetch('http://127.0.0.1:8000/alerts');
+            data = await res.json();
+        }
 
         const alertsContainer = document.getElementById('alerts-container');
 
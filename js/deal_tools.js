@@ -5,48 +5,64 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 async function loadLeadsDropdown() {
-    try {
-        const res = await fetch('http://127.0.0.1:8000/leads');
-        const data = await res.json();
-        const dropdown = document.getElementById('lead-selector');
-        const status = document.getElementById('lead-selector-status');
-
-        if (!data.leads || data.leads.length === 0) {
-            status.innerHTML = 'No leads found. Generate leads first.';
+    const dropdown = document.getElementById('lead-selector');
+    const status = document.getElementById('lead-selector-status');
+
+    dropdown.addEventListener('change', (e) => {
+        selectedLeadId = e.target.value ? parseInt(e.target.value, 10) : null;
+        const dealBtn = document.getElementById('deal-btn');
+        const followupBtn = document.getElementById('followup-btn');
+
+        if (selectedLeadId) {
+            dealBtn.disabled = false;
+            followupBtn.disabled = false;
+            status.innerHTML = `Lead #${selectedLeadId} selected`;
+            status.style.color = 'var(--success)';
+        } else {
+            dealBtn.disabled = true;
+            followupBtn.disabled = true;
+            status.innerHTML = 'Please select a lead';
             status.style.color = 'var(--warning)';
-            return;
         }
+    });
 
-        data.leads.forEach(lead => {
-            const option = document.createElement('option');
-            option.value = lead.id;
-            option.textContent = `${lead.company || `Lead #${lead.id}`} - ${lead.category} - Score ${lead.score} - ${lead.deal_stage || 'Prospecting'}`;
-            dropdown.appendChild(option);
-        });
-
-        status.innerHTML = `${data.leads.length} leads available`;
-        status.style.color = 'var(--success)';
-
-        dropdown.addEventListener('change', (e) => {
-            selectedLeadId = e.target.value ? parseInt(e.target.value, 10) : null;
-            const dealBtn = document.getElementById('deal-btn');
-            const followupBtn = document.getElementById('followup-btn');
+    // Follow next_cursor page by page so every lead ends up in the dropdown.
+    let cursor = null;
+    let loaded = 0;
+    try {
+        do {
+            const params = new URLSearchParams({ fields: 'id,company,score,category,deal_stage', limit: '1000' });
+            if (cursor) params.set('cursor', cursor);
+            const res = await fetch(`http://127.0.0.1:8000/leads?${params}`);
+            const data = await res.json();
+
+            if (!cursor && (!data.leads || data.leads.length === 0)) {
+                status.innerHTML = 'No leads found. Generate leads first.';
+                status.style.color = 'var(--warning)';
+                return;
+            }
 
-            if (selectedLeadId) {
-                dealBtn.disabled = false;
-                followupBtn.disabled = false;
-                status.innerHTML = `Lead #${selectedLeadId} selected`;
+            const fragment = document.createDocumentFragment();
+            data.leads.forEach(lead => {
+                const option = document.createElement('option');
+                option.value = lead.id;
+                option.textContent = `${lead.company || `Lead #${lead.id}`} - ${lead.category} - Score ${lead.score} - ${lead.deal_stage || 'Prospecting'}`;
+                fragment.appendChild(option);
+            });
+            dropdown.appendChild(fragment);
+            loaded += data.leads.length;
+            cursor = data.has_more ? data.next_cursor : null;
+
+            if (!selectedLeadId) {
+                status.innerHTML = cursor ? `${loaded} leads loaded...` : `${loaded} leads available`;
                 status.style.color = 'var(--success)';
-            } else {
-                dealBtn.disabled = true;
-                followupBtn.disabled = true;
-                status.innerHTML = 'Please select a lead';
-                status.style.color = 'var(--warning)';
             }
-        });
+        } while (cursor);
     } catch (e) {
-        document.getElementById('lead-selector-status').innerHTML = 'Failed to load leads. Ensure backend is running.';
-        document.getElementById('lead-selector-status').style.color = 'var(--error)';
+        status.innerHTML = loaded
+            ? `${loaded} leads loaded; failed to load the rest. Ensure backend is running.`
+            : 'Failed to load leads. Ensure backend is running.';
+        status.style.color = 'var(--error)';
     }
 }
 
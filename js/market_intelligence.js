@@ -14,17 +14,7 @@ async function analyzeMarketTrends() {
     btn.disabled = true;
 
     try {
-        const res = await fetch(`${API_BASE}/market/analyze`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ industry, region, time_horizon: horizon })
-        });
-
-        if (!res.ok) {
-            throw new Error(`HTTP ${res.status}`);
-        }
-
-        const data = await res.json();
+        const data = await runJob('market_analysis', { industry, region, time_horizon: horizon });
         if (!Array.isArray(data.demand_trend) || !data.market_matrix || !data.channels) {
             throw new Error('Invalid market response shape');
         }
@@ -40,6 +30,57 @@ async function analyzeMarketTrends() {
     }
 }
 
+// Queue a background job and resolve with its result: SSE when available, polling otherwise.
+async function runJob(feature, payload) {
+    const res = await fetch(`${API_BASE}/jobs/${feature}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload)
+    });
+    if (!res.ok) {
+        throw new Error(`HTTP ${res.status}`);
+    }
+    const job = await res.json();
+
+    const finish = (result) => {
+        if (result.status !== 'succeeded') {
+            throw new Error(result.error || `Job ${result.status}`);
+        }
+        return result.result;
+    };
+
+    if (window.EventSource) {
+        try {
+            const result = await new Promise((resolve, reject) => {
+                const source = new EventSource(`${API_BASE}${job.events_url}`);
+                source.addEventListener('done', (event) => {
+                    source.close();
+                    resolve(JSON.parse(event.data));
+                });
+                source.addEventListener('error', () => {
+                    source.close();
+                    reject(new Error('Job event stream closed'));
+                });
+            });
+            return finish(result);
+        } catch (e) {
+            if (e.message !== 'Job event stream closed') throw e;
+        }
+    }
+
+    for (;;) {
+        const poll = await fetch(`${API_BASE}${job.status_url}`);
+        if (!poll.ok) {
+            throw new Error(`HTTP ${poll.status}`);
+        }
+        const result = await poll.json();
+        if (result.status === 'succeeded' || result.status === 'failed') {
+            return finish(result);
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+}
+
 function updateInsight(data) {
     const box = document.getElementById('mi_insight_box');
     const p = document.getElementById('mi_insight_text');
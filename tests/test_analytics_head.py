@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.db_pool import ConnectionPool
+
+ANALYTICS_PATHS = sorted(main.analytics_validators.paths)
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # A migrated, seeded copy instead of the tracked backend/sales.db.
+    path = str(tmp_path_factory.mktemp("db") / "sales.db")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(main, "_write_pool", ConnectionPool(path))
+        patch.setattr(main, "_read_pool", ConnectionPool(path, readonly=True))
+        patch.setattr(main, "SCHEMA", main.SCHEMA)
+        main.init_db()
+        yield TestClient(main.app)
+        main._write_pool.close_all()
+        main._read_pool.close_all()
+
+
+@pytest.mark.parametrize("path", ANALYTICS_PATHS)
+def test_head_reaches_analytics_route(client, path):
+    get = client.get(path)
+    head = client.head(path)
+    assert get.status_code == 200
+    assert head.status_code == 200, "HEAD fell through to the page catch-all"
+    assert head.headers["etag"] == get.headers["etag"]
+    assert head.headers["content-type"] == get.headers["content-type"]
+    revalidated = client.head(path, headers={"If-None-Match": get.headers["etag"]})
+    assert revalidated.status_code == 304
@@ -0,0 +1,117 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from backend.migrations import apply_migrations
+from backend.snapshot_cache import DataVersion, VersionedCache, read_data_version
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "sales.db")
+    conn = sqlite3.connect(path)
+    apply_migrations(conn)
+    conn.close()
+    return path
+
+
+def _reader(path):
+    def read():
+        conn = sqlite3.connect(path)
+        try:
+            return read_data_version(conn.cursor())
+        finally:
+            conn.close()
+
+    return read
+
+
+def _insert_lead(path, company):
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO leads (company, score) VALUES (?, ?)", (company, 90))
+    conn.commit()
+    conn.close()
+
+
+def test_memoized_read_sees_write_from_another_connection(db_path):
+    version = DataVersion(_reader(db_path))
+    cache = VersionedCache(version)
+    reader = sqlite3.connect(db_path)
+
+    @cache.memoize()
+    def lead_count():
+        return reader.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    assert lead_count() == 0
+    assert lead_count() == 0
+    assert cache.stats()["hits"] == 1
+
+    # Another worker (or an external tool) writes; this process never calls bump().
+    _insert_lead(db_path, "Acme")
+
+    assert lead_count() == 1
+    reader.close()
+
+
+def test_triggers_cover_updates_deletes_and_other_tables(db_path):
+    read = _reader(db_path)
+    _insert_lead(db_path, "Acme")
+    versions = [read()[0]]
+    conn = sqlite3.connect(db_path)
+    for sql in (
+        "UPDATE leads SET deal_stage = 'Proposal'",
+        "INSERT INTO interactions (lead_id, action_type) VALUES (1, 'call')",
+        "INSERT INTO campaigns (product) VALUES ('CRM')",
+        "DELETE FROM leads",
+    ):
+        conn.execute(sql)
+        conn.commit()
+        versions.append(read()[0])
+    conn.close()
+    assert versions == sorted(set(versions))
+
+
+def test_max_age_limits_reads_and_bump_refreshes(db_path):
+    calls = []
+    read = _reader(db_path)
+
+    def counting_reader():
+        calls.append(1)
+        return read()
+
+    version = DataVersion(counting_reader, max_age=60)
+    seen = []
+    version.add_listener(seen.append)
+    start = version.value
+    _insert_lead(db_path, "Acme")
+    assert version.value == start  # within max_age: no re-read
+    assert len(calls) == 1
+    assert version.bump() == start + 1  # after a local write: re-read now
+    assert seen == [start + 1]
+
+
+def test_async_reads_run_off_the_event_loop(db_path):
+    threads = []
+    read = _reader(db_path)
+
+    def recording_reader():
+        threads.append(threading.get_ident())
+        return read()
+
+    version = DataVersion(recording_reader)
+    cache = VersionedCache(version)
+
+    async def total():
+        return 1
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        current = await version.current_async()
+        await cache.get_or_compute_async("total", total)
+        return loop_thread, current
+
+    loop_thread, current = asyncio.run(scenario())
+    assert current == read()
+    assert len(threads) == 2 and loop_thread not in threads
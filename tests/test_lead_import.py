@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from backend.main import SQLITE_INTEGER_MAX, SQLITE_INTEGER_MIN, ScoreRequest
+
+
+@pytest.mark.parametrize("budget", [SQLITE_INTEGER_MAX + 1, SQLITE_INTEGER_MIN - 1, 10**20])
+def test_budget_outside_sqlite_integer_is_rejected(budget):
+    with pytest.raises(ValidationError):
+        ScoreRequest(company="Acme", budget=budget, interest=5)
+
+
+@pytest.mark.parametrize("budget", [SQLITE_INTEGER_MAX, SQLITE_INTEGER_MIN, 0])
+def test_budget_inside_sqlite_integer_is_accepted(budget):
+    assert ScoreRequest(company="Acme", budget=budget, interest=5).budget == budget
+
+
+def _csv_records(text, **limits):
+    from backend.lead_import import iter_csv_records
+
+    async def lines():
+        for line in text.split("\n"):
+            yield line
+
+    async def collect():
+        return [record async for record in iter_csv_records(lines(), **limits)]
+
+    return asyncio.run(collect())
+
+
+def test_quoted_newline_is_one_record():
+    records = _csv_records('company,notes\nAcme,"line one\nline two"\nGlobex,ok')
+    assert records == [(1, {"company": "Acme", "notes": "line one\nline two"}, None), (2, {"company": "Globex", "notes": "ok"}, None)]
+
+
+def test_stray_quote_costs_one_record():
+    rows = "\n".join(f"Company {i},ok" for i in range(20))
+    records = _csv_records(f'company,notes\nBroken,"oops\n{rows}', max_record_lines=5)
+    errors = [record for record in records if record[2]]
+    good = [record[1]["company"] for record in records if record[1]]
+    assert len(errors) == 1 and "Unbalanced quote" in errors[0][2]
+    assert good == [f"Company {i}" for i in range(20)]
+
+
+def test_record_length_is_capped():
+    records = _csv_records('company,notes\nBroken,"' + "x" * 500 + "\nAcme,ok\nGlobex,ok", max_record_chars=100)
+    assert [record[1]["company"] for record in records if record[1]] == ["Acme", "Globex"]
+    assert sum(1 for record in records if record[2]) == 1
+
+
+def test_unterminated_quote_at_end_keeps_following_lines():
+    records = _csv_records('company,notes\nBroken,"oops\nAcme,ok\nGlobex,ok')
+    assert [record[1]["company"] for record in records if record[1]] == ["Acme", "Globex"]
+    assert [record[2] for record in records if record[2]] == ["Unterminated quoted field"]
@@ -0,0 +1,46 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from backend.main import decode_lead_cursor, encode_lead_cursor
+
+
+def _raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [[90, "2026-01-02 10:00:00", 7], [72.5, None, 1]],
+)
+def test_round_trip(values):
+    assert decode_lead_cursor(encode_lead_cursor(*values)) == values
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["90", "2026-01-02", 7],
+        [None, "2026-01-02", 7],
+        [True, "2026-01-02", 7],
+        [90, 20260102, 7],
+        [90, ["2026-01-02"], 7],
+        [90, "2026-01-02", "7"],
+        [90, "2026-01-02", 7.5],
+        [90, "2026-01-02", False],
+        [90, "2026-01-02"],
+        {"score": 90},
+    ],
+)
+def test_wrong_element_types_are_rejected(values):
+    with pytest.raises(HTTPException) as exc:
+        decode_lead_cursor(_raw_cursor(values))
+    assert exc.value.status_code == 400
+
+
+def test_garbage_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_lead_cursor("not-base64!!")
+    assert exc.value.status_code == 400
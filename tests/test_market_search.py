@@ -0,0 +1,92 @@
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.market_search import SearchProvider, build_market_search
+
+SLOW_SECONDS = 1.0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Tavily's POST /search answers slowly, SerpAPI's GET /search.json at once."""
+
+    hits: Counter = Counter()
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.hits["tavily"] += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(SLOW_SECONDS)
+        try:
+            self._reply({"results": [{"title": "Tavily", "content": "slow answer"}]})
+        except OSError:
+            pass  # the client gave up on us
+
+    def do_GET(self):
+        self.hits["serpapi"] += 1
+        self._reply({"organic_results": [{"title": "SerpAPI", "snippet": "fast answer"}]})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.hits = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_provider_is_abstract():
+    with pytest.raises(TypeError):
+        SearchProvider("key", "http://localhost")
+
+
+def test_faster_provider_wins_and_repeat_is_cached(stub_url, monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.setenv("TAVILY_BASE_URL", stub_url)
+    monkeypatch.setenv("SERPAPI_BASE_URL", stub_url)
+    monkeypatch.setenv("MARKET_SEARCH_HEDGE_DELAY", "0.05")
+    market = build_market_search()
+
+    async def scenario():
+        started = time.perf_counter()
+        first = await market.search("SaaS", "EU", "CRM")
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.05)  # let the cancelled straggler unwind
+        leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        second = await market.search("saas", "eu", "crm")
+        await market.aclose()
+        return first, elapsed, leftover, second
+
+    first, elapsed, leftover, second = asyncio.run(scenario())
+
+    # Tavily is tried first but stalls; the hedged SerpAPI request wins.
+    assert first == "SerpAPI: fast answer"
+    assert elapsed < SLOW_SECONDS
+    assert not leftover  # the slow Tavily request was cancelled, not left running
+    stats = market.stats()
+    assert stats["hedges"] == 1 and stats["wins_serpapi"] == 1 and "wins_tavily" not in stats
+
+    # The repeated query is served from the cache without touching either stub.
+    assert second == first
+    assert StubHandler.hits == Counter(tavily=1, serpapi=1)
+    assert stats["cache_misses"] == 1 and market.stats()["cache_hits"] == 1
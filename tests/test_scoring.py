@@ -0,0 +1,61 @@
+import itertools
+import random
+import sys
+
+import pytest
+
+from backend.scoring import (
+    BUDGET_BOUNDS,
+    INTEREST_BOUNDS,
+    category_for_score,
+    recommendation_for_category,
+    score_lead_formula,
+    score_leads_batch,
+)
+
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+BUDGET_EDGES = sorted(
+    {v + d for v in (0,) + BUDGET_BOUNDS for d in (-1, 0, 1)}
+    | {INT64_MIN - 1, INT64_MIN, INT64_MAX, INT64_MAX + 1, -(10**20), 10**20}
+)
+INTEREST_EDGES = sorted(set(range(1, 11)) | {v + d for v in (0, 11) + INTEREST_BOUNDS for d in (-1, 0, 1)})
+
+
+def _scalar(pairs):
+    scores = [score_lead_formula(budget, interest) for budget, interest in pairs]
+    categories = [category_for_score(score) for score in scores]
+    return scores, categories, [recommendation_for_category(category) for category in categories]
+
+
+def _assert_batch_matches(pairs):
+    budgets = [budget for budget, _ in pairs]
+    interests = [interest for _, interest in pairs]
+    expected = _scalar(pairs)
+    actual = score_leads_batch(budgets, interests)
+    for name, exp, act in zip(("scores", "categories", "recommendations"), expected, actual):
+        mismatches = [(pairs[k], e, a) for k, (e, a) in enumerate(zip(exp, act)) if e != a]
+        assert not mismatches, f"{name} differ, first mismatches: {mismatches[:5]}"
+
+
+def test_batch_matches_scalar_at_every_boundary():
+    _assert_batch_matches(list(itertools.product(BUDGET_EDGES, INTEREST_EDGES)))
+
+
+@pytest.mark.parametrize("budget", [INT64_MIN - 1, INT64_MAX + 1, -(10**20), 10**20])
+def test_batch_clamps_budgets_beyond_int64(budget):
+    _assert_batch_matches([(budget, interest) for interest in range(1, 11)])
+
+
+def test_batch_matches_scalar_on_random_sample():
+    rng = random.Random(42)
+    _assert_batch_matches([(rng.randint(-1000, 200_000), rng.randint(-2, 12)) for _ in range(20_000)])
+
+
+def test_empty_batch():
+    assert score_leads_batch([], []) == ([], [], [])
+
+
+def test_fallback_without_numpy_matches(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)  # makes "import numpy" raise ImportError
+    _assert_batch_matches(list(itertools.product(BUDGET_EDGES, INTEREST_EDGES)))
@@ -0,0 +1,45 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+
+
+@pytest.fixture(scope="module")
+def client():
+    # No lifespan: static routes need neither the database nor the job workers.
+    return TestClient(main.app)
+
+
+def test_page_is_gzipped_and_revalidated(client):
+    r = client.get("/leads.html", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["cache-control"] == "public, no-cache"
+    assert client.get("/leads.html", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_fingerprinted_asset_is_immutable(client):
+    page = client.get("/index.html").text
+    ref = re.search(r'(?:src|href)="((?:js|css)/[^"?]+)\?v=([0-9a-f]+)"', page)
+    assert ref, "no fingerprinted asset reference in index.html"
+    r = client.get(f"/{ref.group(1)}", params={"v": ref.group(2)})
+    assert r.status_code == 200
+    assert "immutable" in r.headers["cache-control"]
+
+
+@pytest.mark.parametrize("path", ["/", "/leads.html", "/js/app.js", "/css/style.css", "/health"])
+def test_head(client, path):
+    get = client.get(path, headers={"Accept-Encoding": "identity"})
+    head = client.head(path, headers={"Accept-Encoding": "identity"})
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["content-type"] == get.headers["content-type"]
+    if "etag" in get.headers:
+        assert head.headers["etag"] == get.headers["etag"]
+
+
+def test_unknown_files_are_404(client):
+    assert client.get("/js/missing.js").status_code == 404
+    assert client.head("/nope.html").status_code == 404